@@ -1,66 +1,195 @@
-from algorithms_type.aes import aes_main
-from algorithms_type.rc4_stream_cipher import rc4_main
-from algorithms_type.rsa import rsa_main
-from algorithms_type.caesar_cipher import caesar_main
-from algorithms_type.vigenere_cipher import vigenere_main
-from config import ALGORITHM_METADATA
+import time
+from collections import namedtuple
+
+from algorithms_type import instrumentation
+from algorithms_type.streaming import STREAM_CHUNK_SIZE
+from registry import ALGORITHM_REGISTRY, get_algorithm
+
+BATCH_CHUNK_SIZE = 256  # Messages per task handed to a worker by run_many
+
+
+class OperationCancelled(Exception):
+    """Raised by `AlgorithmSelector.run_algorithm_with_progress` when the caller cancels."""
+
+
+# Outcome of one message in `AlgorithmSelector.run_many`: the encrypted message or the error raised.
+# A collections namedtuple rather than typing.NamedTuple keeps `import algorithms` cheap.
+BatchResult = namedtuple("BatchResult", ["result", "error"], defaults=[None])
+
+
+def encrypt_one(algorithm_name, message, params):
+    """
+    Encrypt one message with setup that has already been done once for the whole batch.
+
+    Returns the encrypted message and any per-message extra (for RSA, its byte lengths).
+    """
+    return get_algorithm(algorithm_name).encrypt_batch_item(message, params)
+
+
+def run_batch_chunk(job):
+    """Worker entry point: encrypt a chunk of messages, capturing each message's error."""
+    algorithm_name, messages, params = job
+    results = []
+    for message in messages:
+        try:
+            results.append((encrypt_one(algorithm_name, message, params), None))
+        except Exception as e:
+            results.append(((None, None), e))
+    return results
 
 
 class AlgorithmSelector:
-    def __init__(self):
+    def __init__(self, rsa_key_pool=None, keystore=None):
         self.generated_metadata = {}
+        self.rsa_key_pool = rsa_key_pool  # Optional RSAKeyPool used for RSA keypairs
+        self.keystore = keystore  # Optional KeyStore that persists generated RSA keys
+
+    @property
+    def algorithms(self) -> dict:
+        """The registered algorithms by name (see `registry.register_algorithm`)."""
+        return ALGORITHM_REGISTRY
 
-        self.algorithms = {
-            "AES": aes_main,
-            "RC4 Stream Cipher": rc4_main,
-            "RSA": rsa_main,
-            "Caesar Cipher": caesar_main,
-            "Vigenere Cipher": vigenere_main,
-        }
+    @property
+    def context(self) -> dict:
+        return {"key_pool": self.rsa_key_pool, "keystore": self.keystore}
 
     def run_algorithm(self, algorithm_name, message, key=None, include_special_chars=None):
-        if algorithm_name not in self.algorithms:
-            raise ValueError(f"Algorithm '{algorithm_name}' is not available.")
+        spec = get_algorithm(algorithm_name)
+        start = time.perf_counter() if instrumentation.enabled else None
+        encrypted_message, metadata = spec.encrypt(message, key, include_special_chars, self.context)
+        if start is not None:
+            instrumentation.record(f"selector.{algorithm_name}", time.perf_counter() - start, len(message.encode()))
+        if spec.generated_key and metadata is not None:
+            self.generated_metadata[algorithm_name] = metadata
+        return encrypted_message
 
-        algorithm_metadata = ALGORITHM_METADATA[algorithm_name]
-        key_type = algorithm_metadata["key_type"]
+    def encrypt_into(self, algorithm_name, data, out=None, key=None, include_special_chars=None) -> memoryview:
+        """
+        Bytes-level counterpart of `run_algorithm` for any buffer-protocol object.
 
-        if key_type in ["int", "str"]:
-            if algorithm_name in ["Caesar Cipher", "Vigenere Cipher"]:
-                return self.algorithms[algorithm_name](message, key, include_special_chars)
-            else:
-                return self.algorithms[algorithm_name](message, key)
+        The ciphertext is written into `out` (a bytearray, memoryview or other writable
+        buffer) when given, otherwise into a new buffer; the returned memoryview covers
+        exactly the bytes written. Generated keys are recorded as in `run_algorithm`.
+        """
+        spec = get_algorithm(algorithm_name)
+        start = time.perf_counter() if instrumentation.enabled else None
+        encrypted, metadata = spec.encrypt_into(data, out, key, include_special_chars, self.context)
+        if start is not None:
+            instrumentation.record(f"selector.{algorithm_name}", time.perf_counter() - start, memoryview(data).nbytes)
+        if spec.generated_key and metadata is not None:
+            self.generated_metadata[algorithm_name] = metadata
+        return encrypted
+
+    def profile_algorithm(self, algorithm_name, message, key=None, include_special_chars=None,
+                          mode="cprofile", limit=25) -> tuple:
+        """
+        Run `run_algorithm` once under a profiler; returns the result and the profile report.
+
+        mode is "cprofile" (deterministic) or "sample" (periodic stack sampling); see
+        `instrumentation.profile_call`.
+        """
+        return instrumentation.profile_call(self.run_algorithm, algorithm_name, message, key, include_special_chars,
+                                            mode=mode, limit=limit)
+
+    def run_algorithm_with_progress(self, algorithm_name, message, key=None, include_special_chars=None,
+                                    progress=None, cancelled=None, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Like `run_algorithm`, but reports progress and can be cancelled.
+
+        Algorithms registered with `streaming` are encrypted `chunk_size` characters at a
+        time: `progress(done, total)` is called after each chunk and `OperationCancelled`
+        is raised as soon as `cancelled()` returns true. Algorithms with `stepwise` (AES,
+        RSA, hybrid) generate their key and then encrypt in steps the same way. Other
+        algorithms run in a single step, checked for cancellation before and after.
+        """
+        cancelled = cancelled or (lambda: False)
+        if cancelled():
+            raise OperationCancelled()
+        spec = get_algorithm(algorithm_name)
+        if spec.stepwise:
+            steps = spec.encrypt_steps(message, key, include_special_chars, self.context, chunk_size)
+            try:
+                while True:
+                    done, total = next(steps)
+                    if cancelled():
+                        steps.close()
+                        raise OperationCancelled()
+                    if progress is not None:
+                        progress(done, total)
+            except StopIteration as finished:
+                encrypted_message, metadata = finished.value
+            if metadata is not None:
+                self.generated_metadata[algorithm_name] = metadata
+            return encrypted_message
+        if not spec.streaming:
+            result = self.run_algorithm(algorithm_name, message, key, include_special_chars)
+            if cancelled():
+                raise OperationCancelled()
+            if progress is not None:
+                progress(len(message), len(message))
+            return result
+
+        chunks = (message[i:i + chunk_size] for i in range(0, len(message), chunk_size))
+        encrypted_chunks, separator = spec.stream(chunks, key, include_special_chars)
+
+        results = []
+        done = 0
+        for chunk in encrypted_chunks:
+            if cancelled():
+                raise OperationCancelled()
+            results.append(chunk)
+            # Streams skip chunks that encrypt to nothing, so count progress from the input side
+            done = min(len(message), done + chunk_size)
+            if progress is not None:
+                progress(done, len(message))
+        if progress is not None:
+            progress(len(message), len(message))
+        return separator.join(result for result in results if result)
+
+    def run_many(self, algorithm_name, messages, key=None, include_special_chars=None, executor=None,
+                 workers=None, chunk_size=BATCH_CHUNK_SIZE):
+        """
+        Encrypt many messages with one algorithm and return a BatchResult per message, in input order.
+
+        Setup runs once for the whole batch: AES uses one generated key (with a fresh IV
+        per message) and RSA one keypair, recorded in `generated_metadata` like a single run.
+        Messages are dispatched in chunks of `chunk_size` to an executor chosen by
+        `executor` ("inline", "thread" or "process"), defaulting to the algorithm's
+        registered `batch_executor`. A failing message does not stop the batch.
+        """
+        spec = get_algorithm(algorithm_name)
+        messages, params, metadata = spec.prepare_batch(list(messages), key, include_special_chars, self.context)
+
+        jobs = [(algorithm_name, messages[i:i + chunk_size], params) for i in range(0, len(messages), chunk_size)]
+        executor = executor or spec.batch_executor
+        if executor == "inline" or len(jobs) <= 1:
+            chunks = [run_batch_chunk(job) for job in jobs]
+        elif executor in ["thread", "process"]:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor  # Slow to import; only needed here
+
+            pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+            with pool_class(max_workers=workers) as pool:
+                chunks = list(pool.map(run_batch_chunk, jobs))
         else:
-            result = self.algorithms[algorithm_name](message)
-
-            if algorithm_metadata.get("generated_key", False):
-                if algorithm_name == "AES":
-                    self.generated_metadata[algorithm_name] = {
-                        "key": result["key"],
-                        "iv": result["iv"]
-                    }
-                elif algorithm_name == "RSA":
-                    self.generated_metadata[algorithm_name] = {
-                        "public_key": result["public_key"],
-                        "private_key": result["private_key"],
-                        "byte_lengths": result["byte_lengths"]
-                    }
-
-            return result["encrypted_message"]
-
-    def get_generated_key(self, algorithm_name):
-        if algorithm_name == "AES":
-            return {
-                "key": self.generated_metadata["AES"]["key"],
-                "iv": self.generated_metadata["AES"]["iv"]
-            }
-        elif algorithm_name == "RSA":
-            public_key = self.generated_metadata["RSA"]["public_key"]
-            private_key = self.generated_metadata["RSA"]["private_key"]
-            return {
-                "public_key": f"{public_key[0]},{public_key[1]}",
-                "private_key": f"{private_key[0]},{private_key[1]}",
-            }
-        return None
+            raise ValueError(f"Unknown executor '{executor}'.")
+
+        results = []
+        extras = []
+        for chunk in chunks:
+            for (encrypted_message, extra), error in chunk:
+                results.append(BatchResult(encrypted_message, error))
+                extras.append(extra)
 
+        if metadata is not None:
+            self.generated_metadata[algorithm_name] = spec.finish_batch(metadata, extras)
+        return results
 
+    def get_generated_key(self, algorithm_name, key_id=None):
+        spec = get_algorithm(algorithm_name)
+        if key_id is not None:
+            if self.keystore is None:
+                raise ValueError("No key store is configured.")
+            return spec.format_generated_key(spec.stored_key_metadata(self.keystore.get(key_id), key_id))
+        if algorithm_name not in self.generated_metadata:
+            return None
+        return spec.format_generated_key(self.generated_metadata[algorithm_name])
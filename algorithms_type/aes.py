@@ -1,9 +1,45 @@
 import os
+import struct
+from functools import lru_cache
+
+from algorithms_type.buffers import byte_view, output_view
+from algorithms_type.instrumentation import instrumented
+
+
+S_BOX = (  # AES substitution box for byte substitution
+    0x63, 0x7c, 0x77, 0x7b, 0xf2, 0x6b, 0x6f, 0xc5, 0x30, 0x01, 0x67, 0x2b, 0xfe, 0xd7, 0xab, 0x76,
+    0xca, 0x82, 0xc9, 0x7d, 0xfa, 0x59, 0x47, 0xf0, 0xad, 0xd4, 0xa2, 0xaf, 0x9c, 0xa4, 0x72, 0xc0,
+    0xb7, 0xfd, 0x93, 0x26, 0x36, 0x3f, 0xf7, 0xcc, 0x34, 0xa5, 0xe5, 0xf1, 0x71, 0xd8, 0x31, 0x15,
+    0x04, 0xc7, 0x23, 0xc3, 0x18, 0x96, 0x05, 0x9a, 0x07, 0x12, 0x80, 0xe2, 0xeb, 0x27, 0xb2, 0x75,
+    0x09, 0x83, 0x2c, 0x1a, 0x1b, 0x6e, 0x5a, 0xa0, 0x52, 0x3b, 0xd6, 0xb3, 0x29, 0xe3, 0x2f, 0x84,
+    0x53, 0xd1, 0x00, 0xed, 0x20, 0xfc, 0xb1, 0x5b, 0x6a, 0xcb, 0xbe, 0x39, 0x4a, 0x4c, 0x58, 0xcf,
+    0xd0, 0xef, 0xaa, 0xfb, 0x43, 0x4d, 0x33, 0x85, 0x45, 0xf9, 0x02, 0x7f, 0x50, 0x3c, 0x9f, 0xa8,
+    0x51, 0xa3, 0x40, 0x8f, 0x92, 0x9d, 0x38, 0xf5, 0xbc, 0xb6, 0xda, 0x21, 0x10, 0xff, 0xf3, 0xd2,
+    0xcd, 0x0c, 0x13, 0xec, 0x5f, 0x97, 0x44, 0x17, 0xc4, 0xa7, 0x7e, 0x3d, 0x64, 0x5d, 0x19, 0x73,
+    0x60, 0x81, 0x4f, 0xdc, 0x22, 0x2a, 0x90, 0x88, 0x46, 0xee, 0xb8, 0x14, 0xde, 0x5e, 0x0b, 0xdb,
+    0xe0, 0x32, 0x3a, 0x0a, 0x49, 0x06, 0x24, 0x5c, 0xc2, 0xd3, 0xac, 0x62, 0x91, 0x95, 0xe4, 0x79,
+    0xe7, 0xc8, 0x37, 0x6d, 0x8d, 0xd5, 0x4e, 0xa9, 0x6c, 0x56, 0xf4, 0xea, 0x65, 0x7a, 0xae, 0x08,
+    0xba, 0x78, 0x25, 0x2e, 0x1c, 0xa6, 0xb4, 0xc6, 0xe8, 0xdd, 0x74, 0x1f, 0x4b, 0xbd, 0x8b, 0x8a,
+    0x70, 0x3e, 0xb5, 0x66, 0x48, 0x03, 0xf6, 0x0e, 0x61, 0x35, 0x57, 0xb9, 0x86, 0xc1, 0x1d, 0x9e,
+    0xe1, 0xf8, 0x98, 0x11, 0x69, 0xd9, 0x8e, 0x94, 0x9b, 0x1e, 0x87, 0xe9, 0xce, 0x55, 0x28, 0xdf,
+    0x8c, 0xa1, 0x89, 0x0d, 0xbf, 0xe6, 0x42, 0x68, 0x41, 0x99, 0x2d, 0x0f, 0xb0, 0x54, 0xbb, 0x16
+)
+
+
+AES_KEY_SIZES = (16, 24, 32)  # AES-128, AES-192 and AES-256
+DEFAULT_KEY_SIZE = 32  # Generated keys are AES-256
+
+
+def generate_key(size=DEFAULT_KEY_SIZE) -> bytes:
+    """Generates an AES key of 16, 24 or 32 bytes."""
+    if size not in AES_KEY_SIZES:
+        raise ValueError("AES keys must be 16, 24 or 32 bytes.")
+    return os.urandom(size)
 
 
 def generate_128_bit_key() -> bytes:
     """Generates a 128-bit (16-byte) AES key."""
-    return os.urandom(16)
+    return generate_key(16)
 
 
 def generate_iv() -> bytes:
@@ -21,14 +57,14 @@ def message_to_blocks(message: bytes, block_size=16) -> list:
     return [message[i:i + block_size] for i in range(0, len(message), block_size)]
 
 
-def message_padding(message: str, block_size=16) -> bytes:
+def message_padding(message, block_size=16) -> bytes:
     """Pads the message to ensure it is a multiple of block_size using PKCS#7 padding."""
-    message_bytes = message.encode()  # Ensure message is in bytes
+    message_bytes = message.encode() if isinstance(message, str) else bytes(message)  # Ensure message is in bytes
     padding_len = block_size - (len(message_bytes) % block_size)
     return message_bytes + bytes([padding_len] * padding_len)
 
 
-def galois_multiply(a, b) -> list:
+def galois_multiply(a, b) -> int:
     """Perform multiplication in GF(2^8) as used in AES."""
     p = 0
     for i in range(8):
@@ -42,145 +78,556 @@ def galois_multiply(a, b) -> list:
     return p & 0xff  # Ensure the result fits in one byte
 
 
-def sub_bytes(state, s_box) -> list:
-    """Apply SubBytes transformation on the state matrix."""
-    return [[s_box[byte] for byte in row] for row in state]
-
-
-def shift_rows(state) -> list:
-    """Perform the ShiftRows transformation on the state matrix."""
-    return [row[i:] + row[:i] for i, row in enumerate(state)]
-
-
-def mix_columns(state) -> list:
-    """Perform the MixColumns transformation on the state matrix."""
-    for col in range(4):  # Process each column
-        a = state[0][col]
-        b = state[1][col]
-        c = state[2][col]
-        d = state[3][col]
-
-        # Compute the transformed column
-        state[0][col] = galois_multiply(a, 2) ^ galois_multiply(b, 3) ^ c ^ d
-        state[1][col] = a ^ galois_multiply(b, 2) ^ galois_multiply(c, 3) ^ d
-        state[2][col] = a ^ b ^ galois_multiply(c, 2) ^ galois_multiply(d, 3)
-        state[3][col] = galois_multiply(a, 3) ^ b ^ c ^ galois_multiply(d, 2)
-
-    return state
+def rotate_word(word: int, bits: int) -> int:
+    """Rotate a 32-bit word right by the given number of bits."""
+    return ((word >> bits) | (word << (32 - bits))) & 0xffffffff
+
+
+def build_encryption_tables(s_box) -> tuple:
+    """
+    Precompute the AES encryption T-tables.
+
+    Each entry of T0 is the MixColumns image of the column (S[x], 0, 0, 0), so one
+    lookup performs SubBytes and MixColumns for a single byte; T1..T3 are the same
+    table rotated for the other rows. The S-box shifted into each byte lane is
+    returned as well for the final round, which has no MixColumns.
+    """
+    t0 = []
+    for x in range(256):
+        s = s_box[x]
+        t0.append((galois_multiply(s, 2) << 24) | (s << 16) | (s << 8) | galois_multiply(s, 3))
+    t1 = tuple(rotate_word(w, 8) for w in t0)
+    t2 = tuple(rotate_word(w, 16) for w in t0)
+    t3 = tuple(rotate_word(w, 24) for w in t0)
+    s24 = tuple(s << 24 for s in s_box)
+    s16 = tuple(s << 16 for s in s_box)
+    s8 = tuple(s << 8 for s in s_box)
+    return tuple(t0), t1, t2, t3, s24, s16, s8
+
+
+def build_decryption_tables(inv_s_box) -> tuple:
+    """
+    Precompute the AES decryption T-tables.
+
+    Mirrors `build_encryption_tables`: Td0 combines InvSubBytes with InvMixColumns for one
+    byte, Td1..Td3 are its rotations, and the shifted inverse S-box serves the final round.
+    """
+    td0 = []
+    for x in range(256):
+        s = inv_s_box[x]
+        td0.append((galois_multiply(s, 14) << 24) | (galois_multiply(s, 9) << 16)
+                   | (galois_multiply(s, 13) << 8) | galois_multiply(s, 11))
+    td1 = tuple(rotate_word(w, 8) for w in td0)
+    td2 = tuple(rotate_word(w, 16) for w in td0)
+    td3 = tuple(rotate_word(w, 24) for w in td0)
+    inv_s24 = tuple(s << 24 for s in inv_s_box)
+    inv_s16 = tuple(s << 16 for s in inv_s_box)
+    inv_s8 = tuple(s << 8 for s in inv_s_box)
+    return tuple(td0), td1, td2, td3, inv_s24, inv_s16, inv_s8
+
+
+INV_S_BOX = tuple(S_BOX.index(x) for x in range(256))
+
+T0, T1, T2, T3, S24, S16, S8 = build_encryption_tables(S_BOX)
+TD0, TD1, TD2, TD3, INV_S24, INV_S16, INV_S8 = build_decryption_tables(INV_S_BOX)
+
+# Bytes handed to each worker process by the parallel modes; a multiple of 16.
+PARALLEL_CHUNK_SIZE = 1 << 20
+INTO_CHUNK_SIZE = 1 << 16  # Bytes per struct.pack_into in aes_encrypt_into, bounding the temporary word list
+ROUND_KEY_CACHE_SIZE = 512  # Keys whose expanded round keys are kept, per direction
+
+RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1B, 0x36]
+
+
+@instrumented("aes.key_schedule", size=len)
+def key_schedule(key: bytes) -> list:
+    """
+    Expand a 16, 24 or 32-byte AES key into its 11, 13 or 15 round keys (10, 12 or 14 rounds).
+
+    Each round key is a tuple of four 32-bit big-endian column words, which is the
+    layout `encrypt_words` consumes, so the expansion only has to happen once per key.
+    """
+    if len(key) not in AES_KEY_SIZES:
+        raise ValueError("AES requires a 16, 24 or 32-byte key.")
+
+    nk = len(key) // 4
+    words = list(struct.unpack(f">{nk}I", key))
+    for i in range(nk, 4 * (nk + 7)):  # Nr = Nk + 6 rounds need 4 * (Nr + 1) words
+        temp = words[i - 1]
+        if i % nk == 0:
+            # RotWord, SubWord and Rcon folded into one expression
+            temp = (S24[(temp >> 16) & 0xff] ^ S16[(temp >> 8) & 0xff]
+                    ^ S8[temp & 0xff] ^ S_BOX[temp >> 24] ^ (RCON[i // nk - 1] << 24))
+        elif nk > 6 and i % nk == 4:
+            # AES-256 applies SubWord alone halfway through each 8-word block
+            temp = S24[temp >> 24] ^ S16[(temp >> 16) & 0xff] ^ S8[(temp >> 8) & 0xff] ^ S_BOX[temp & 0xff]
+        words.append(words[i - nk] ^ temp)
+    return [tuple(words[i:i + 4]) for i in range(0, len(words), 4)]
+
+
+def inverse_key_schedule(round_keys: list) -> list:
+    """
+    Derive the decryption round keys for the equivalent inverse cipher.
+
+    The round keys are used in reverse order, and InvMixColumns is applied to every
+    middle round key so `decrypt_words` can use the same table-driven round shape as
+    encryption. Passing a byte through the S-box first cancels the InvSubBytes that
+    the decryption tables fold in.
+    """
+    inverse = [round_keys[-1]]
+    for round_key in reversed(round_keys[1:-1]):
+        inverse.append(tuple(
+            TD0[S_BOX[w >> 24]] ^ TD1[S_BOX[w >> 16 & 0xff]] ^ TD2[S_BOX[w >> 8 & 0xff]] ^ TD3[S_BOX[w & 0xff]]
+            for w in round_key
+        ))
+    inverse.append(round_keys[0])
+    return inverse
+
+
+@lru_cache(maxsize=ROUND_KEY_CACHE_SIZE)
+def cached_key_schedule(key: bytes) -> tuple:
+    """
+    `key_schedule` behind a bounded LRU cache keyed by the key bytes.
+
+    Repeated operations under the same key skip the expansion. The cache holds key
+    material; empty it with `clear_round_key_caches` when keys are retired.
+    """
+    return tuple(key_schedule(key))
+
+
+@lru_cache(maxsize=ROUND_KEY_CACHE_SIZE)
+def cached_inverse_key_schedule(key: bytes) -> tuple:
+    """Decryption round keys (see `inverse_key_schedule`) behind a bounded LRU cache keyed by the key bytes."""
+    return tuple(inverse_key_schedule(cached_key_schedule(key)))
+
+
+def round_key_cache_info() -> dict:
+    """Hits, misses, size and hit rate of the encryption and decryption round key caches."""
+    info = {}
+    for name, cache in (("encryption", cached_key_schedule), ("decryption", cached_inverse_key_schedule)):
+        hits, misses, maxsize, currsize = cache.cache_info()
+        info[name] = {
+            "hits": hits,
+            "misses": misses,
+            "size": currsize,
+            "maxsize": maxsize,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+    return info
 
 
-def add_round_key(state, round_key) -> list:
-    """XOR the state matrix with the round key."""
-    return [[state[row][col] ^ round_key[row][col] for col in range(4)] for row in range(4)]
+def clear_round_key_caches() -> None:
+    cached_key_schedule.cache_clear()
+    cached_inverse_key_schedule.cache_clear()
 
 
-def key_schedule(key, s_box) -> list:
-    """Generate AES-128 round keys from the original 16-byte key."""
-    RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1B, 0x36]
+def encrypt_words(s0: int, s1: int, s2: int, s3: int, round_keys: list) -> tuple:
+    """Encrypt one block held as four 32-bit column words and return the four output words."""
+    t0, t1, t2, t3 = T0, T1, T2, T3
 
-    def sub_word(word):
-        """Substitute each byte in the word using the AES S-Box."""
-        return [s_box[b] for b in word]
+    # Initial AddRoundKey
+    k0, k1, k2, k3 = round_keys[0]
+    s0 ^= k0
+    s1 ^= k1
+    s2 ^= k2
+    s3 ^= k3
+
+    # Main rounds: SubBytes, ShiftRows and MixColumns via table lookups, then AddRoundKey
+    for k0, k1, k2, k3 in round_keys[1:-1]:
+        s0, s1, s2, s3 = (
+            t0[s0 >> 24] ^ t1[s1 >> 16 & 0xff] ^ t2[s2 >> 8 & 0xff] ^ t3[s3 & 0xff] ^ k0,
+            t0[s1 >> 24] ^ t1[s2 >> 16 & 0xff] ^ t2[s3 >> 8 & 0xff] ^ t3[s0 & 0xff] ^ k1,
+            t0[s2 >> 24] ^ t1[s3 >> 16 & 0xff] ^ t2[s0 >> 8 & 0xff] ^ t3[s1 & 0xff] ^ k2,
+            t0[s3 >> 24] ^ t1[s0 >> 16 & 0xff] ^ t2[s1 >> 8 & 0xff] ^ t3[s2 & 0xff] ^ k3,
+        )
+
+    # Final round: SubBytes, ShiftRows, AddRoundKey
+    k0, k1, k2, k3 = round_keys[-1]
+    return (
+        S24[s0 >> 24] ^ S16[s1 >> 16 & 0xff] ^ S8[s2 >> 8 & 0xff] ^ S_BOX[s3 & 0xff] ^ k0,
+        S24[s1 >> 24] ^ S16[s2 >> 16 & 0xff] ^ S8[s3 >> 8 & 0xff] ^ S_BOX[s0 & 0xff] ^ k1,
+        S24[s2 >> 24] ^ S16[s3 >> 16 & 0xff] ^ S8[s0 >> 8 & 0xff] ^ S_BOX[s1 & 0xff] ^ k2,
+        S24[s3 >> 24] ^ S16[s0 >> 16 & 0xff] ^ S8[s1 >> 8 & 0xff] ^ S_BOX[s2 & 0xff] ^ k3,
+    )
+
+
+def decrypt_words(s0: int, s1: int, s2: int, s3: int, round_keys: list) -> tuple:
+    """Decrypt one block held as four 32-bit column words using `inverse_key_schedule` keys."""
+    t0, t1, t2, t3 = TD0, TD1, TD2, TD3
 
-    def rot_word(word):
-        """Rotate the word (4 bytes) left by one position."""
-        return word[1:] + word[:1]
+    # Initial AddRoundKey
+    k0, k1, k2, k3 = round_keys[0]
+    s0 ^= k0
+    s1 ^= k1
+    s2 ^= k2
+    s3 ^= k3
+
+    # Main rounds: InvSubBytes, InvShiftRows and InvMixColumns via table lookups, then AddRoundKey
+    for k0, k1, k2, k3 in round_keys[1:-1]:
+        s0, s1, s2, s3 = (
+            t0[s0 >> 24] ^ t1[s3 >> 16 & 0xff] ^ t2[s2 >> 8 & 0xff] ^ t3[s1 & 0xff] ^ k0,
+            t0[s1 >> 24] ^ t1[s0 >> 16 & 0xff] ^ t2[s3 >> 8 & 0xff] ^ t3[s2 & 0xff] ^ k1,
+            t0[s2 >> 24] ^ t1[s1 >> 16 & 0xff] ^ t2[s0 >> 8 & 0xff] ^ t3[s3 & 0xff] ^ k2,
+            t0[s3 >> 24] ^ t1[s2 >> 16 & 0xff] ^ t2[s1 >> 8 & 0xff] ^ t3[s0 & 0xff] ^ k3,
+        )
+
+    # Final round: InvSubBytes, InvShiftRows, AddRoundKey
+    k0, k1, k2, k3 = round_keys[-1]
+    return (
+        INV_S24[s0 >> 24] ^ INV_S16[s3 >> 16 & 0xff] ^ INV_S8[s2 >> 8 & 0xff] ^ INV_S_BOX[s1 & 0xff] ^ k0,
+        INV_S24[s1 >> 24] ^ INV_S16[s0 >> 16 & 0xff] ^ INV_S8[s3 >> 8 & 0xff] ^ INV_S_BOX[s2 & 0xff] ^ k1,
+        INV_S24[s2 >> 24] ^ INV_S16[s1 >> 16 & 0xff] ^ INV_S8[s0 >> 8 & 0xff] ^ INV_S_BOX[s3 & 0xff] ^ k2,
+        INV_S24[s3 >> 24] ^ INV_S16[s2 >> 16 & 0xff] ^ INV_S8[s1 >> 8 & 0xff] ^ INV_S_BOX[s0 & 0xff] ^ k3,
+    )
+
+
+def aes_encrypt(block: bytes, round_keys: list) -> bytes:
+    """Perform AES encryption on a single 128-bit block."""
+    return struct.pack(">4I", *encrypt_words(*struct.unpack(">4I", block), round_keys))
 
-    # Split the initial key into 4 words (4 bytes each)
-    words = [list(key[i: i + 4]) for i in range(0, len(key), 4)]
 
-    for i in range(4, 44):  # Generate 44 words total (AES-128)
-        temp = words[i - 1]  # Get the previous word
-        if i % 4 == 0:
-            temp = sub_word(rot_word(temp))  # Apply RotWord and SubWord
-            temp[0] ^= RCON[(i // 4) - 1]  # Add Rcon to the first byte
-        words.append([w ^ t for w, t in zip(words[i - 4], temp)])
-    return words
+def aes_decrypt(block: bytes, round_keys: list) -> bytes:
+    """Perform AES decryption on a single 128-bit block using `inverse_key_schedule` keys."""
+    return struct.pack(">4I", *decrypt_words(*struct.unpack(">4I", block), round_keys))
 
 
-def aes_round(state, round_key, s_box) -> list:
-    """Perform one AES round: SubBytes, ShiftRows, MixColumns, AddRoundKey."""
-    state = sub_bytes(state, s_box)     # Step 1: SubBytes
-    state = shift_rows(state)          # Step 2: ShiftRows
-    state = mix_columns(state)         # Step 3: MixColumns
-    state = add_round_key(state, round_key)  # Step 4: AddRoundKey
-    return state
+def aes_encrypt_cbc(plaintext: bytes, key: bytes, iv: bytes) -> bytes:
+    """Encrypt plaintext using AES in CBC mode."""
+    if len(plaintext) % 16:
+        raise ValueError("Plaintext length must be a multiple of 16 bytes.")
+    return cbc_encrypt_chunk(plaintext, cached_key_schedule(bytes(key)), iv)
 
 
-def final_round(state, round_key, s_box) -> list:
-    """Perform the final AES round: SubBytes, ShiftRows, AddRoundKey."""
-    state = sub_bytes(state, s_box)     # Step 1: SubBytes
-    state = shift_rows(state)          # Step 2: ShiftRows
-    state = add_round_key(state, round_key)  # Step 3: AddRoundKey
-    return state
+def cbc_encrypt_chunk(plaintext: bytes, round_keys: list, iv: bytes) -> bytes:
+    """Encrypt whole CBC blocks with an expanded key, chained to the IV (or the previous ciphertext block)."""
+    ciphertext = cbc_encrypt_words(plaintext, round_keys, iv)
+    return struct.pack(f">{len(ciphertext)}I", *ciphertext)
 
 
-def aes_encrypt(block, round_keys, s_box) -> list:
-    """Perform AES encryption on a single 128-bit block."""
-    state = [list(block[i:i + 4]) for i in range(0, len(block), 4)]  # Convert block to 4x4 matrix
+@instrumented("aes.rounds", size=lambda plaintext, *args: len(plaintext))
+def cbc_encrypt_words(plaintext, round_keys: list, iv) -> list:
+    """Like `cbc_encrypt_chunk`, for any bytes-like plaintext, returning the ciphertext as 32-bit words."""
+    words = struct.unpack(f">{len(plaintext) // 4}I", plaintext)
+    ciphertext = []
+    p0, p1, p2, p3 = struct.unpack(">4I", iv)
+
+    # Each block is chained to the previous ciphertext block before encryption
+    blocks = iter(words)
+    for w0, w1, w2, w3 in zip(blocks, blocks, blocks, blocks):
+        p0, p1, p2, p3 = encrypt_words(w0 ^ p0, w1 ^ p1, w2 ^ p2, w3 ^ p3, round_keys)
+        ciphertext += (p0, p1, p2, p3)
+
+    return ciphertext
+
+
+def aes_encrypt_cbc_stream(chunks, key: bytes, iv: bytes):
+    """
+    AES-CBC encrypt an iterable of byte chunks with PKCS#7 padding, yielding ciphertext as it goes.
+
+    A partial block is held back between chunks and each chunk is chained to the last
+    ciphertext block of the one before, so the output joins into `aes_encrypt_cbc` of the
+    padded whole.
+    """
+    round_keys = cached_key_schedule(bytes(key))
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk
+        cut = len(data) - len(data) % 16
+        carry = data[cut:]
+        if cut:
+            encrypted_chunk = cbc_encrypt_chunk(data[:cut], round_keys, iv)
+            iv = encrypted_chunk[-16:]
+            yield encrypted_chunk
+    yield cbc_encrypt_chunk(message_padding(carry), round_keys, iv)
+
+
+def aes_encrypted_size(length: int) -> int:
+    """Size of the CBC ciphertext of `length` plaintext bytes after PKCS#7 padding."""
+    return length - length % 16 + 16
+
+
+def aes_encrypt_into(data, key: bytes, iv: bytes, out=None) -> memoryview:
+    """
+    AES-CBC encrypt the bytes of any buffer-protocol object with PKCS#7 padding.
+
+    Whole blocks are read straight from the input and packed straight into `out` (a new
+    buffer when None; see `aes_encrypted_size`), so only the final padded block is
+    copied. Returns a view of the ciphertext.
+    """
+    if len(iv) != 16:
+        raise ValueError("IV must be 16 bytes.")
+
+    view = byte_view(data)
+    full = len(view) - len(view) % 16
+    out = output_view(out, aes_encrypted_size(len(view)))
+    round_keys = cached_key_schedule(bytes(key))
+
+    chain = iv
+    for start in range(0, full, INTO_CHUNK_SIZE):
+        end = min(full, start + INTO_CHUNK_SIZE)
+        struct.pack_into(f">{(end - start) // 4}I", out, start, *cbc_encrypt_words(view[start:end], round_keys, chain))
+        chain = out[end - 16:end]
+    struct.pack_into(">4I", out, full, *cbc_encrypt_words(message_padding(view[full:]), round_keys, chain))
+    return out[:full + 16]
+
+
+@instrumented("aes.rounds", size=lambda ciphertext, *args: len(ciphertext))
+def cbc_decrypt_chunk(ciphertext: bytes, round_keys: list, iv: bytes) -> bytes:
+    """
+    Decrypt a run of CBC blocks given the ciphertext block that precedes them (or the IV).
+
+    Every block is decrypted independently, then the whole run is XOR-ed with the
+    ciphertext shifted by one block in a single big-integer operation.
+    """
+    words = struct.unpack(f">{len(ciphertext) // 4}I", ciphertext)
+    decrypted = []
+    blocks = iter(words)
+    for w0, w1, w2, w3 in zip(blocks, blocks, blocks, blocks):
+        decrypted += decrypt_words(w0, w1, w2, w3, round_keys)
+
+    decrypted = struct.pack(f">{len(decrypted)}I", *decrypted)
+    chain = iv + ciphertext[:-16]
+    result = int.from_bytes(decrypted, "big") ^ int.from_bytes(chain, "big")
+    return result.to_bytes(len(ciphertext), "big")
+
+
+def _cbc_decrypt_chunk(job: tuple) -> bytes:
+    """Process pool entry point: decrypt one CBC chunk."""
+    return cbc_decrypt_chunk(*job)
+
+
+def message_unpadding(padded_message: bytes, block_size=16) -> bytes:
+    """Strip and validate PKCS#7 padding."""
+    if not padded_message or len(padded_message) % block_size:
+        raise ValueError("Padded message length must be a non-zero multiple of the block size.")
+    padding_len = padded_message[-1]
+    if not 1 <= padding_len <= block_size or padded_message[-padding_len:] != bytes([padding_len] * padding_len):
+        raise ValueError("Invalid PKCS#7 padding.")
+    return padded_message[:-padding_len]
+
+
+def aes_decrypt_cbc(ciphertext: bytes, key: bytes, iv: bytes, chunk_size=PARALLEL_CHUNK_SIZE,
+                    workers=None) -> bytes:
+    """
+    Decrypt ciphertext using AES in CBC mode.
+
+    Unlike encryption, each plaintext block depends only on two ciphertext blocks, so
+    inputs larger than chunk_size are decrypted as independent chunks in a process pool of
+    up to `workers` processes (default: one per CPU). Padding is left in place.
+    """
+    if len(ciphertext) % 16:
+        raise ValueError("Ciphertext length must be a multiple of 16 bytes.")
+    if chunk_size <= 0 or chunk_size % 16:
+        raise ValueError("Chunk size must be a positive multiple of 16 bytes.")
+
+    round_keys = cached_inverse_key_schedule(bytes(key))
+    jobs = [
+        (ciphertext[i:i + chunk_size], round_keys, ciphertext[i - 16:i] if i else iv)
+        for i in range(0, len(ciphertext), chunk_size)
+    ]
+    return b''.join(map_chunks(_cbc_decrypt_chunk, jobs, workers))
+
+
+@instrumented("aes.rounds", size=lambda data, *args: len(data))
+def ctr_keystream_xor(data: bytes, round_keys: list, counter: int) -> bytes:
+    """XOR data with the AES-CTR keystream that starts at the given 128-bit counter value."""
+    block_count = (len(data) + 15) // 16
+    keystream = []
+    for c in range(counter, counter + block_count):
+        c &= (1 << 128) - 1  # The counter block wraps around like a 128-bit register
+        keystream += encrypt_words(c >> 96, (c >> 64) & 0xffffffff, (c >> 32) & 0xffffffff, c & 0xffffffff,
+                                   round_keys)
+    keystream = struct.pack(f">{len(keystream)}I", *keystream)[:len(data)]
+    result = int.from_bytes(data, "big") ^ int.from_bytes(keystream, "big")
+    return result.to_bytes(len(data), "big")
+
+
+def _ctr_chunk(job: tuple) -> bytes:
+    """Process pool entry point: encrypt one CTR chunk."""
+    return ctr_keystream_xor(*job)
+
+
+def map_chunks(func, jobs: list, workers=None) -> list:
+    """Run func over jobs, in a process pool when there is more than one job and worker."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        return [func(job) for job in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor  # Imported on first use; slow to import
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        return list(executor.map(func, jobs))
+
+
+def aes_encrypt_ctr(data: bytes, key: bytes, nonce: bytes, chunk_size=PARALLEL_CHUNK_SIZE, workers=None) -> bytes:
+    """
+    Encrypt (or decrypt) data using AES in CTR mode.
+
+    The 16-byte nonce is the initial counter block. Inputs larger than chunk_size are split
+    into chunks that are encrypted in a process pool of up to `workers` processes
+    (default: one per CPU); each chunk starts at its own counter offset, so the output is
+    identical to encrypting the whole buffer in one pass.
+    """
+    if len(nonce) != 16:
+        raise ValueError("CTR nonce must be 16 bytes.")
+    if chunk_size <= 0 or chunk_size % 16:
+        raise ValueError("Chunk size must be a positive multiple of 16 bytes.")
+
+    round_keys = cached_key_schedule(bytes(key))
+    counter = int.from_bytes(nonce, "big")
+    jobs = [
+        (data[i:i + chunk_size], round_keys, counter + i // 16)
+        for i in range(0, len(data), chunk_size)
+    ]
+    return b''.join(map_chunks(_ctr_chunk, jobs, workers))
+
+
+@lru_cache(maxsize=None)
+def numpy_tables() -> dict:
+    """Build the uint8 lookup arrays used by the NumPy batch engine (imported on first use)."""
+    import numpy as np
+
+    return {
+        "s_box": np.array(S_BOX, dtype=np.uint8),
+        "mul2": np.array([galois_multiply(x, 2) for x in range(256)], dtype=np.uint8),
+        "mul3": np.array([galois_multiply(x, 3) for x in range(256)], dtype=np.uint8),
+        # Byte i of the state is row i % 4 of column i // 4; ShiftRows moves row r left by r columns
+        "shift_rows": np.array([4 * ((i // 4 + i % 4) % 4) + i % 4 for i in range(16)], dtype=np.intp),
+    }
+
+
+@instrumented("aes.rounds", size=lambda state, *args: state.size)
+def encrypt_blocks_numpy(state, round_keys):
+    """
+    Encrypt an (M, 16) uint8 array of independent blocks.
+
+    SubBytes and the GF(2^8) multiplications of MixColumns are table gathers over the
+    whole array, ShiftRows is a column permutation and AddRoundKey a broadcast XOR, so
+    the interpreter runs each AES step once per round rather than once per block.
+    `round_keys` is an (Nr + 1, 16) uint8 array.
+    """
+    import numpy as np
+
+    tables = numpy_tables()
+    s_box, mul2, mul3, shift_rows = tables["s_box"], tables["mul2"], tables["mul3"], tables["shift_rows"]
+
+    state = state ^ round_keys[0]
+    for round_key in round_keys[1:-1]:
+        state = s_box[state][:, shift_rows]
+        columns = state.reshape(-1, 4, 4)
+        # out[r] = 2*a[r] ^ 3*a[r+1] ^ a[r+2] ^ a[r+3] within each column
+        columns = (mul2[columns] ^ np.roll(mul3[columns], -1, axis=2)
+                   ^ np.roll(columns, -2, axis=2) ^ np.roll(columns, -3, axis=2))
+        state = columns.reshape(-1, 16) ^ round_key
+    return s_box[state][:, shift_rows] ^ round_keys[-1]
+
+
+def aes_encrypt_batch(messages: list, key: bytes, ivs: list) -> list:
+    """
+    Encrypt many independent str/bytes messages with AES-CBC and PKCS#7 padding in one vectorized pass.
+
+    Each message is chained from its own IV, so the result for message i equals
+    `aes_encrypt_cbc(padded message i, key, ivs[i])`. All blocks live in one NumPy uint8
+    array; block position j of every message long enough to have one is encrypted together.
+    """
+    import numpy as np
+
+    if len(messages) != len(ivs):
+        raise ValueError("Each message needs its own IV.")
+    if not messages:
+        return []
+
+    padded = [message_padding(m) for m in messages]
+    block_counts = np.array([len(m) // 16 for m in padded])
+
+    # Longest messages first, so the messages still active at block j are a prefix
+    order = np.argsort(-block_counts, kind="stable")
+    counts = block_counts[order]
+    data = np.zeros((len(messages), int(counts[0]), 16), dtype=np.uint8)
+    for row, index in enumerate(order):
+        data[row, :counts[row]] = np.frombuffer(padded[index], dtype=np.uint8).reshape(-1, 16)
+
+    round_keys = np.frombuffer(b''.join(struct.pack(">4I", *rk) for rk in cached_key_schedule(bytes(key))),
+                               dtype=np.uint8).reshape(-1, 16)
+    previous = np.frombuffer(b''.join(ivs[i] for i in order), dtype=np.uint8).reshape(-1, 16).copy()
+    active_per_block = np.searchsorted(-counts, -np.arange(1, counts[0] + 1), side="right")
+
+    for j, active in enumerate(active_per_block):
+        previous[:active] = encrypt_blocks_numpy(data[:active, j] ^ previous[:active], round_keys)
+        data[:active, j] = previous[:active]
+
+    results = [None] * len(messages)
+    for row, index in enumerate(order):
+        results[index] = data[row, :counts[row]].tobytes()
+    return results
+
+
+@instrumented("aes.encode_output", size=len)
+def ciphertext_to_hex(ciphertext: bytes) -> str:
+    """Hex-encode ciphertext for display."""
+    return ciphertext.hex()
+
+
+def aes_batch_main(messages: list):
+    """Encrypt a batch of messages under one generated key, each with its own IV."""
+    try:
+        key = generate_key()
+        ivs = [generate_iv() for _ in messages]
 
-    # Initial AddRoundKey
-    state = add_round_key(state, round_keys[0:4])
+        encrypted_messages = aes_encrypt_batch(messages, key, ivs)
 
-    # Perform 9 main rounds
-    for round in range(1, 10):
-        state = aes_round(state, round_keys[round * 4:(round + 1) * 4], s_box)
+        return {
+            "encrypted_messages": [ciphertext_to_hex(m) for m in encrypted_messages],
+            "key": key.hex(),
+            "ivs": [iv.hex() for iv in ivs]
+        }
 
-    # Perform final round
-    state = final_round(state, round_keys[10 * 4:(10 + 1) * 4], s_box)
+    except Exception as e:
+        raise ValueError(f"AES encryption failed: {e}")
 
-    return state
 
+def aes_ctr_main(message: str, chunk_size=PARALLEL_CHUNK_SIZE, workers=None):
+    """Encrypt a message using AES in CTR mode."""
+    try:
+        key = generate_key()
+        nonce = generate_iv()
 
-def aes_encrypt_cbc(plaintext: bytes, key: bytes, s_box: list, iv: bytes) -> bytes:
-    """Encrypt plaintext using AES in CBC mode."""
-    round_keys = key  # Placeholder for key schedule
-    blocks = message_to_blocks(plaintext)
-    ciphertext = []
-    previous_block = iv
+        encrypted_message = aes_encrypt_ctr(message.encode(), key, nonce, chunk_size, workers)
 
-    for block in blocks:
-        block = xor_bytes(block, previous_block)
-        encrypted_block = block
-        ciphertext.append(encrypted_block)
-        previous_block = encrypted_block
+        return {
+            "encrypted_message": ciphertext_to_hex(encrypted_message),
+            "key": key.hex(),
+            "nonce": nonce.hex()
+        }
 
-    return b''.join(ciphertext)
+    except Exception as e:
+        raise ValueError(f"AES encryption failed: {e}")
 
 
 def aes_main(message: str):
     """Encrypt a message using AES in CBC mode."""
     try:
-        key = generate_128_bit_key()
+        key = generate_key()
         iv = generate_iv()
 
-        S_BOX = [  # AES substitution box for byte substitution
-            0x63, 0x7c, 0x77, 0x7b, 0xf2, 0x6b, 0x6f, 0xc5, 0x30, 0x01, 0x67, 0x2b, 0xfe, 0xd7, 0xab, 0x76,
-            0xca, 0x82, 0xc9, 0x7d, 0xfa, 0x59, 0x47, 0xf0, 0xad, 0xd4, 0xa2, 0xaf, 0x9c, 0xa4, 0x72, 0xc0,
-            0xb7, 0xfd, 0x93, 0x26, 0x36, 0x3f, 0xf7, 0xcc, 0x34, 0xa5, 0xe5, 0xf1, 0x71, 0xd8, 0x31, 0x15,
-            0x04, 0xc7, 0x23, 0xc3, 0x18, 0x96, 0x05, 0x9a, 0x07, 0x12, 0x80, 0xe2, 0xeb, 0x27, 0xb2, 0x75,
-            0x09, 0x83, 0x2c, 0x1a, 0x1b, 0x6e, 0x5a, 0xa0, 0x52, 0x3b, 0xd6, 0xb3, 0x29, 0xe3, 0x2f, 0x84,
-            0x53, 0xd1, 0x00, 0xed, 0x20, 0xfc, 0xb1, 0x5b, 0x6a, 0xcb, 0xbe, 0x39, 0x4a, 0x4c, 0x58, 0xcf,
-            0xd0, 0xef, 0xaa, 0xfb, 0x43, 0x4d, 0x33, 0x85, 0x45, 0xf9, 0x02, 0x7f, 0x50, 0x3c, 0x9f, 0xa8,
-            0x51, 0xa3, 0x40, 0x8f, 0x92, 0x9d, 0x38, 0xf5, 0xbc, 0xb6, 0xda, 0x21, 0x10, 0xff, 0xf3, 0xd2,
-            0xcd, 0x0c, 0x13, 0xec, 0x5f, 0x97, 0x44, 0x17, 0xc4, 0xa7, 0x7e, 0x3d, 0x64, 0x5d, 0x19, 0x73,
-            0x60, 0x81, 0x4f, 0xdc, 0x22, 0x2a, 0x90, 0x88, 0x46, 0xee, 0xb8, 0x14, 0xde, 0x5e, 0x0b, 0xdb,
-            0xe0, 0x32, 0x3a, 0x0a, 0x49, 0x06, 0x24, 0x5c, 0xc2, 0xd3, 0xac, 0x62, 0x91, 0x95, 0xe4, 0x79,
-            0xe7, 0xc8, 0x37, 0x6d, 0x8d, 0xd5, 0x4e, 0xa9, 0x6c, 0x56, 0xf4, 0xea, 0x65, 0x7a, 0xae, 0x08,
-            0xba, 0x78, 0x25, 0x2e, 0x1c, 0xa6, 0xb4, 0xc6, 0xe8, 0xdd, 0x74, 0x1f, 0x4b, 0xbd, 0x8b, 0x8a,
-            0x70, 0x3e, 0xb5, 0x66, 0x48, 0x03, 0xf6, 0x0e, 0x61, 0x35, 0x57, 0xb9, 0x86, 0xc1, 0x1d, 0x9e,
-            0xe1, 0xf8, 0x98, 0x11, 0x69, 0xd9, 0x8e, 0x94, 0x9b, 0x1e, 0x87, 0xe9, 0xce, 0x55, 0x28, 0xdf,
-            0x8c, 0xa1, 0x89, 0x0d, 0xbf, 0xe6, 0x42, 0x68, 0x41, 0x99, 0x2d, 0x0f, 0xb0, 0x54, 0xbb, 0x16
-        ]
-
         padded_message = message_padding(message)
-        encrypted_message = aes_encrypt_cbc(padded_message, key, S_BOX, iv)
+        encrypted_message = aes_encrypt_cbc(padded_message, key, iv)
 
         return {
-            "encrypted_message": encrypted_message.hex(),
+            "encrypted_message": ciphertext_to_hex(encrypted_message),
             "key": key.hex(),
             "iv": iv.hex()
         }
 
     except Exception as e:
-        raise ValueError(f"AES encryption failed: {e}")
\ No newline at end of file
+        raise ValueError(f"AES encryption failed: {e}")
+
+
+def aes_decrypt_main(encrypted_message: str, key: str, iv: str) -> str:
+    """Decrypt a hex message produced by `aes_main` with its hex key and IV."""
+    try:
+        padded_message = aes_decrypt_cbc(bytes.fromhex(encrypted_message), bytes.fromhex(key), bytes.fromhex(iv))
+        return message_unpadding(padded_message).decode()
+
+    except Exception as e:
+        raise ValueError(f"AES decryption failed: {e}")
@@ -0,0 +1,40 @@
+"""Helpers for the bytes-level `*_encrypt_into` functions, which accept any buffer-protocol object."""
+
+
+def byte_view(data) -> memoryview:
+    """A flat unsigned-byte memoryview of any buffer-protocol object, without copying."""
+    view = memoryview(data)
+    return view if view.format == 'B' and view.ndim == 1 else view.cast('B')
+
+
+def output_view(out, size: int) -> memoryview:
+    """
+    A writable byte view of `out` with room for `size` bytes, or of a new bytearray when out is None.
+
+    Raises ValueError when out is read-only or too small.
+    """
+    if out is None:
+        return memoryview(bytearray(size))
+    view = byte_view(out)
+    if view.readonly:
+        raise ValueError("Output buffer is read-only.")
+    if len(view) < size:
+        raise ValueError(f"Output buffer too small: {size} bytes needed, {len(view)} available.")
+    return view
+
+
+def as_bytes(view: memoryview):
+    """The underlying bytes or bytearray if the view covers one entirely, otherwise a copy (for translate)."""
+    obj = view.obj
+    if isinstance(obj, (bytes, bytearray)) and len(obj) == len(view):
+        return obj
+    return view.tobytes()
+
+
+def write_output(result, out) -> memoryview:
+    """Return a view of result, copied into the start of `out` when one is given."""
+    if out is None:
+        return memoryview(result)
+    out = output_view(out, len(result))
+    out[:len(result)] = result
+    return out[:len(result)]
@@ -1,3 +1,11 @@
+from functools import lru_cache
+
+from algorithms_type.buffers import as_bytes, byte_view, output_view
+from algorithms_type.instrumentation import instrumented
+from algorithms_type.streaming import STREAM_CHUNK_SIZE, iter_chunks
+from algorithms_type.translation import NON_ALPHA_BYTES, CharacterTable
+
+
 def shift_character(char: str, shift: int, char_range: int = 26) -> str:
     """Shift a single alphabetic character by a specified amount."""
     if char.islower():
@@ -17,16 +25,78 @@ def shift_character(char: str, shift: int, char_range: int = 26) -> str:
 
     return chr(new_char_code)
 
+@lru_cache(maxsize=256)
+def caesar_table(shift: int, include_special_chars: bool) -> CharacterTable:
+    """Memoized translation table mapping each character as `encrypt_message` would."""
+    def map_character(char):
+        if char.isalpha():
+            return shift_character(char, shift)
+        return char if include_special_chars else None
+
+    return CharacterTable(map_character)
+
+
+@instrumented("caesar.translate", size=lambda message, *args: len(message.encode()))
 def encrypt_message(message: str, shift: int, include_special_chars: bool) -> str:
     """Encrypt a message using a Caesar Cipher shift, with optional inclusion of special characters."""
-    result = ''
-    for char in message:
-        if char.isalpha():
-            result += shift_character(char, shift)
-        else:
-            if include_special_chars:
-                result += char
-    return result
+    return message.translate(caesar_table(shift, bool(include_special_chars)))
+
+
+TRANSLATE_CHUNK_SIZE = 1 << 16  # Bytes translated at a time into a caller's buffer
+
+
+@lru_cache(maxsize=32)
+def caesar_byte_table(shift: int) -> bytes:
+    """
+    `bytes.translate` table shifting ASCII letters exactly as `shift_character` does.
+
+    Raises ValueError for shifts that move a letter outside ASCII, whose str result has
+    no single-byte equivalent.
+    """
+    table = bytearray(range(256))
+    for b in range(256):
+        if not bytes([b]).isalpha():
+            continue
+        char = shift_character(chr(b), shift)
+        if not char.isascii():
+            raise ValueError(f"Caesar shift {shift} moves letters outside ASCII; encrypt bytes with a shift of 0-25.")
+        table[b] = ord(char)
+    return bytes(table)
+
+
+@instrumented("caesar.translate", size=lambda data, *args, **kwargs: len(byte_view(data)))
+def caesar_encrypt_into(data, shift: int, include_special_chars: bool, out=None) -> memoryview:
+    """
+    Encrypt the bytes of any buffer-protocol object, writing into `out` if given.
+
+    Only ASCII letters are shifted; other bytes are kept or, without special characters,
+    dropped. Returns a view of the bytes written (of a new buffer when out is None); a
+    given `out` is filled chunk by chunk, without an intermediate copy of the whole result.
+    """
+    view = byte_view(data)
+    table = caesar_byte_table(shift)
+    delete = b'' if include_special_chars else NON_ALPHA_BYTES
+    if out is None:
+        return memoryview(as_bytes(view).translate(table, delete))
+
+    out = output_view(out, len(view) if include_special_chars else 0)
+    position = 0
+    for i in range(0, len(view), TRANSLATE_CHUNK_SIZE):
+        encrypted = view[i:i + TRANSLATE_CHUNK_SIZE].tobytes().translate(table, delete)
+        if position + len(encrypted) > len(out):
+            needed = position + len(view[i:].tobytes().translate(table, delete))
+            raise ValueError(f"Output buffer too small: {needed} bytes needed, {len(out)} available.")
+        out[position:position + len(encrypted)] = encrypted
+        position += len(encrypted)
+    return out[:position]
+
+def caesar_stream(source, shift: int, include_special_chars: bool, chunk_size=STREAM_CHUNK_SIZE):
+    """Encrypt a file-like object or iterable of text chunks, yielding encrypted chunks."""
+    table = caesar_table(shift, bool(include_special_chars))
+    for chunk in iter_chunks(source, chunk_size):
+        encrypted_chunk = chunk.translate(table)
+        if encrypted_chunk:
+            yield encrypted_chunk
 
 # Main function
 def caesar_main(message: str, shift: int, include_special_chars: bool) -> str:
@@ -0,0 +1,151 @@
+"""
+Key recovery for the Caesar and Vigenere ciphers using NumPy letter statistics.
+
+Ciphertext is converted to an array of letter indices (0-25, or -1 for anything that is
+not an ASCII letter) that keeps every character's position, because the Vigenere key
+advances on every character. Recovery therefore assumes the ciphertext was produced with
+special characters included; with them stripped, the key phase of each letter is lost.
+
+Like `vigenere_cipher.encrypt_character`, the shift a key character applies depends on
+whether its case matches the message letter: a lowercase key shifts uppercase letters by
+6 more (32 mod 26), an uppercase key shifts lowercase letters by 6 less. `key_case`
+selects which case of key to recover.
+"""
+import numpy as np
+
+from algorithms_type.caesar_cipher import encrypt_message
+
+# Relative frequencies of a-z in English text
+ENGLISH_FREQUENCIES = np.array([
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015, 0.06094, 0.06966,
+    0.00153, 0.00772, 0.04025, 0.02406, 0.06749, 0.07507, 0.01929, 0.00095, 0.05987,
+    0.06327, 0.09056, 0.02758, 0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+])
+ENGLISH_FREQUENCIES = ENGLISH_FREQUENCIES / ENGLISH_FREQUENCIES.sum()
+
+# SHIFT_INDEX[k, p] is the ciphertext letter that plaintext letter p becomes under key shift k
+SHIFT_INDEX = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+
+IOC_SAMPLE_SIZE = 1 << 18  # Characters examined when estimating the key length
+
+CASE_OFFSETS = {"lower": (0, 6), "upper": (20, 0)}  # Extra shift of (lowercase, uppercase) letters
+
+
+def text_to_codes(text: str):
+    """Return the Unicode code points of text as an integer array, one entry per character."""
+    if text.isascii():
+        return np.frombuffer(text.encode("ascii"), dtype=np.uint8).astype(np.int32)
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+
+def codes_to_text(codes) -> str:
+    return codes.astype(np.uint32).tobytes().decode("utf-32-le")
+
+
+def letter_indices(text: str, key_case="lower"):
+    """
+    Map each character to its letter index 0-25, or -1 for non-letters.
+
+    The extra shift that `key_case` implies for the other case of letters is removed, so
+    every letter at a given key position carries the same shift.
+    """
+    codes = text_to_codes(text)
+    lower_offset, upper_offset = CASE_OFFSETS[key_case]
+    lower = (codes >= ord("a")) & (codes <= ord("z"))
+    upper = (codes >= ord("A")) & (codes <= ord("Z"))
+    indices = np.full(codes.shape, -1, dtype=np.int16)
+    indices[lower] = (codes[lower] - ord("a") - lower_offset) % 26
+    indices[upper] = (codes[upper] - ord("A") - upper_offset) % 26
+    return indices
+
+
+def column_histograms(indices, period: int):
+    """Letter counts of each key position, shape (period, 26), via a strided (rows, period) view."""
+    padded = np.concatenate([indices, np.full(-len(indices) % period, -1, dtype=indices.dtype)])
+    columns = padded.reshape(-1, period)
+    # Offset each column's letters into its own 27-bin block; bin 0 of a block collects non-letters
+    bins = (columns + 1) + 27 * np.arange(period)[None, :]
+    counts = np.bincount(bins.ravel(), minlength=27 * period).reshape(period, 27)
+    return counts[:, 1:]
+
+
+def chi_squared_shifts(histograms):
+    """Chi-squared score of every key shift for each histogram row; shape (rows, 26)."""
+    histograms = np.atleast_2d(histograms).astype(np.float64)
+    totals = histograms.sum(axis=1, keepdims=True)
+    expected = np.maximum(totals[:, :, None] * ENGLISH_FREQUENCIES[None, None, :], 1e-9)
+    observed = histograms[:, SHIFT_INDEX]  # observed[row, k, p]: count of plaintext letter p under shift k
+    return ((observed - expected) ** 2 / expected).sum(axis=2)
+
+
+def index_of_coincidence(histograms):
+    """Index of coincidence of each histogram row."""
+    histograms = histograms.astype(np.float64)
+    totals = histograms.sum(axis=1)
+    pairs = (histograms * (histograms - 1)).sum(axis=1)
+    return np.divide(pairs, totals * (totals - 1), out=np.zeros_like(totals), where=totals > 1)
+
+
+def crack_caesar(ciphertext: str) -> int:
+    """
+    Recover the shift passed to `caesar_cipher.encrypt_message`.
+
+    All 26 candidate shifts are scored at once by chi-squared against English letter
+    frequencies. The result is in 0-25, so only shifts in 0-25 are recovered: other
+    shifts do not wrap modulo 26 in `shift_character` and can leave the alphabet.
+    """
+    indices = letter_indices(ciphertext)
+    histogram = np.bincount(indices[indices >= 0], minlength=26)
+    # encrypt_message subtracts the shift, which is a key shift of -shift
+    return int(-np.argmin(chi_squared_shifts(histogram)[0]) % 26)
+
+
+def decrypt_caesar(ciphertext: str, shift: int) -> str:
+    """Undo `caesar_cipher.encrypt_message` for a shift in 0-25."""
+    return encrypt_message(ciphertext, -shift, True)
+
+
+def key_length_from_indices(indices, max_period=40, sample_size=IOC_SAMPLE_SIZE) -> int:
+    """
+    Estimate the Vigenere key length from the index of coincidence of each candidate period.
+
+    Multiples of the true length score as well as the length itself, so the smallest
+    period within 10% of the best mean index of coincidence is chosen. The statistic
+    converges quickly, so only the first `sample_size` characters are examined.
+    """
+    indices = indices[:sample_size]
+    max_period = max(1, min(max_period, len(indices) // 2))
+    scores = np.array([
+        index_of_coincidence(column_histograms(indices, period)).mean()
+        for period in range(1, max_period + 1)
+    ])
+    return int(np.flatnonzero(scores >= 0.9 * scores.max())[0]) + 1
+
+
+def estimate_key_length(ciphertext: str, max_period=40, key_case="lower") -> int:
+    """Estimate the Vigenere key length of a ciphertext (see `key_length_from_indices`)."""
+    return key_length_from_indices(letter_indices(ciphertext, key_case), max_period)
+
+
+def crack_vigenere(ciphertext: str, max_period=40, key_length=None, key_case="lower") -> str:
+    """Recover a Vigenere key: estimate its length, then solve each key position as a Caesar shift."""
+    indices = letter_indices(ciphertext, key_case)
+    if key_length is None:
+        key_length = key_length_from_indices(indices, max_period)
+    shifts = np.argmin(chi_squared_shifts(column_histograms(indices, key_length)), axis=1)
+    base = ord("a") if key_case == "lower" else ord("A")
+    return "".join(chr(base + int(shift)) for shift in shifts)
+
+
+def decrypt_vigenere(ciphertext: str, key: str) -> str:
+    """Undo `vigenere_cipher.vigenere_encryption` (with special characters kept) for an alphabetic key."""
+    codes = text_to_codes(ciphertext).astype(np.int64)
+    key_codes = np.array([ord(char) for char in key], dtype=np.int64)
+    key_codes = np.resize(key_codes, len(codes))
+
+    for first, last in (("a", "z"), ("A", "Z")):
+        mask = (codes >= ord(first)) & (codes <= ord(last))
+        base = ord(first)
+        # encrypt_character adds ord(key_char) - base modulo 26
+        codes[mask] = (codes[mask] - key_codes[mask]) % 26 + base
+    return codes_to_text(codes)
@@ -0,0 +1,104 @@
+"""
+Hybrid RSA+AES encryption: the payload is encrypted with AES-CBC under a random session
+key, and only the session key is encrypted with RSA.
+
+The ciphertext is the RSA-wrapped session key (one packed RSA block, see
+`rsa.encrypt_bytes_packed`), the 16-byte IV, then the AES-CBC ciphertext of the
+PKCS#7-padded payload. RSA costs one modular exponentiation per message whatever its
+size; the rest runs at AES throughput.
+"""
+import base64
+
+from algorithms_type.aes import (aes_decrypt_cbc, aes_encrypt_into, aes_encrypted_size, generate_iv, generate_key,
+                                 message_unpadding)
+from algorithms_type.buffers import byte_view, output_view
+from algorithms_type.rsa import (RSAPrivateKey, decrypt_bytes_packed, encrypt_bytes_packed, generate_rsa_key,
+                                 packed_block_sizes)
+
+
+def wrapped_key_size(n: int) -> int:
+    """Size of the RSA-wrapped session key under modulus n: one packed ciphertext block."""
+    return packed_block_sizes(n)[1]
+
+
+def hybrid_encrypted_size(length: int, n: int) -> int:
+    """Size of the hybrid ciphertext of `length` plaintext bytes under modulus n."""
+    return wrapped_key_size(n) + 16 + aes_encrypted_size(length)
+
+
+def wrap_session_key(session_key: bytes, public_key: tuple) -> bytes:
+    """Encrypt an AES session key with the RSA public key."""
+    if len(session_key) + 1 > packed_block_sizes(public_key[1])[0]:
+        raise ValueError("RSA modulus is too small to wrap the session key.")
+    return encrypt_bytes_packed(session_key, public_key)
+
+
+def hybrid_header(public_key: tuple, session_key=None, iv=None) -> tuple:
+    """Return the wrapped session key followed by the IV, with the session key and IV used."""
+    session_key = generate_key() if session_key is None else session_key
+    iv = generate_iv() if iv is None else iv
+    if len(iv) != 16:
+        raise ValueError("IV must be 16 bytes.")
+    return wrap_session_key(session_key, public_key) + iv, session_key, iv
+
+
+def hybrid_encrypt_into(data, public_key: tuple, out=None, session_key=None, iv=None) -> memoryview:
+    """
+    Hybrid-encrypt the bytes of any buffer-protocol object into `out` (a new buffer when None).
+
+    A fresh AES-256 session key and IV are generated unless given. Returns a view of the
+    ciphertext (see `hybrid_encrypted_size`).
+    """
+    view = byte_view(data)
+    out = output_view(out, hybrid_encrypted_size(len(view), public_key[1]))
+    header, session_key, iv = hybrid_header(public_key, session_key, iv)
+    out[:len(header)] = header
+    encrypted = aes_encrypt_into(view, session_key, iv, out[len(header):])
+    return out[:len(header) + len(encrypted)]
+
+
+def hybrid_encrypt(data, public_key: tuple) -> bytes:
+    return bytes(hybrid_encrypt_into(data, public_key))
+
+
+def hybrid_decrypt(data: bytes, key: RSAPrivateKey) -> bytes:
+    """Decrypt bytes produced by `hybrid_encrypt`: unwrap the session key with RSA, then decrypt with AES."""
+    header_size = wrapped_key_size(key.n) + 16
+    if len(data) < header_size + 16:
+        raise ValueError("Hybrid ciphertext is too short.")
+    session_key = decrypt_bytes_packed(data[:header_size - 16], key)
+    iv = data[header_size - 16:header_size]
+    return message_unpadding(aes_decrypt_cbc(data[header_size:], session_key, iv))
+
+
+def hybrid_encryption(message: str, public_key: tuple) -> str:
+    """Hybrid-encrypt a message under the RSA public key and return it Base64-encoded."""
+    return base64.b64encode(hybrid_encrypt(message.encode(), public_key)).decode('utf-8')
+
+
+def hybrid_main(message: str, key_pool=None) -> dict:
+    """
+    Hybrid-encrypt a message and return it Base64-encoded along with the RSA keys.
+
+    With a key pool (see `rsa_key_pool.RSAKeyPool`) the keypair is taken from the pool.
+    """
+    try:
+        key = key_pool.get() if key_pool is not None else generate_rsa_key()
+        return {
+            "encrypted_message": hybrid_encryption(message, key.public_key),
+            "public_key": key.public_key,
+            "private_key": key.private_key,
+            "key": key
+        }
+
+    except Exception as e:
+        raise ValueError(f"Hybrid encryption failed: {e}")
+
+
+def hybrid_decrypt_main(encrypted_message: str, key: RSAPrivateKey) -> str:
+    """Decrypt a Base64 message produced by `hybrid_main`."""
+    try:
+        return hybrid_decrypt(base64.b64decode(encrypted_message), key).decode()
+
+    except Exception as e:
+        raise ValueError(f"Hybrid decryption failed: {e}")
@@ -0,0 +1,167 @@
+"""
+Opt-in instrumentation of the algorithms' phases: call counts, bytes processed and latency histograms.
+
+Instrumented functions are wrapped with `instrumented(phase, size)`; while instrumentation
+is disabled (the default) the wrapper only checks one flag before calling the function,
+and nothing is recorded. Enable it with `enable()`, read it with `snapshot()` or
+`to_prometheus()`, and clear it with `reset()`.
+
+Metrics are kept per process: work done in process pools (AES CTR/CBC decryption,
+`run_many` with the process executor) is not recorded by the parent.
+"""
+import time
+from bisect import bisect_left
+
+# Upper bounds (seconds) of the latency histogram buckets; a final +Inf bucket is implied
+LATENCY_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0)
+
+enabled = False
+_metrics = {}  # phase -> [calls, bytes, seconds, bucket counts]
+_lock = None  # Created by enable(); threading is only imported when instrumentation is used
+
+
+def enable() -> None:
+    global enabled, _lock
+    if _lock is None:
+        import threading
+        _lock = threading.Lock()
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    _metrics.clear()
+
+
+def record(phase: str, seconds: float, nbytes=0) -> None:
+    """Record one call of a phase; ignored while instrumentation is disabled."""
+    if not enabled:
+        return
+    with _lock:
+        metric = _metrics.get(phase)
+        if metric is None:
+            metric = _metrics[phase] = [0, 0, 0.0, [0] * (len(LATENCY_BUCKETS) + 1)]
+        metric[0] += 1
+        metric[1] += nbytes
+        metric[2] += seconds
+        metric[3][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+
+def instrumented(phase: str, size=None):
+    """
+    Decorator recording each call of the function as `phase`.
+
+    `size`, if given, is called with the function's arguments and returns the number of
+    bytes the call processes.
+    """
+    from functools import wraps  # Only needed by the algorithm modules; keeps `import algorithms` cheap
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            record(phase, time.perf_counter() - start, size(*args, **kwargs) if size is not None else 0)
+            return result
+        return wrapper
+    return decorator
+
+
+def snapshot() -> dict:
+    """Copy of the metrics: phase -> calls, bytes, seconds_total and cumulative histogram by bucket bound."""
+    if _lock is None:
+        return {}
+    with _lock:
+        metrics = {phase: (calls, nbytes, seconds, list(buckets))
+                   for phase, (calls, nbytes, seconds, buckets) in _metrics.items()}
+
+    result = {}
+    for phase, (calls, nbytes, seconds, buckets) in sorted(metrics.items()):
+        histogram = {}
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), buckets):
+            cumulative += count
+            histogram[bound] = cumulative
+        result[phase] = {"calls": calls, "bytes": nbytes, "seconds_total": seconds, "histogram": histogram}
+    return result
+
+
+def to_prometheus(metrics=None, prefix="crypto") -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    metrics = snapshot() if metrics is None else metrics
+    lines = [
+        f"# HELP {prefix}_phase_calls_total Calls of each instrumented phase.",
+        f"# TYPE {prefix}_phase_calls_total counter",
+    ]
+    lines += [f'{prefix}_phase_calls_total{{phase="{phase}"}} {m["calls"]}' for phase, m in metrics.items()]
+    lines += [
+        f"# HELP {prefix}_phase_bytes_total Bytes processed by each instrumented phase.",
+        f"# TYPE {prefix}_phase_bytes_total counter",
+    ]
+    lines += [f'{prefix}_phase_bytes_total{{phase="{phase}"}} {m["bytes"]}' for phase, m in metrics.items()]
+    lines += [
+        f"# HELP {prefix}_phase_seconds Latency of each instrumented phase.",
+        f"# TYPE {prefix}_phase_seconds histogram",
+    ]
+    for phase, m in metrics.items():
+        for bound, count in m["histogram"].items():
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{prefix}_phase_seconds_bucket{{phase="{phase}",le="{le}"}} {count}')
+        lines.append(f'{prefix}_phase_seconds_sum{{phase="{phase}"}} {m["seconds_total"]!r}')
+        lines.append(f'{prefix}_phase_seconds_count{{phase="{phase}"}} {m["calls"]}')
+    return "\n".join(lines) + "\n"
+
+
+def profile_call(func, *args, mode="cprofile", interval=0.001, limit=25, **kwargs) -> tuple:
+    """
+    Run func(*args, **kwargs) under a profiler and return (result, report text).
+
+    mode "cprofile" gives cProfile's deterministic statistics sorted by cumulative time;
+    mode "sample" samples the calling thread's stack every `interval` seconds from a
+    background thread, which costs far less but only shows where time was spent.
+    """
+    if mode == "cprofile":
+        import cProfile
+        import io
+        import pstats
+
+        profiler = cProfile.Profile()
+        result = profiler.runcall(func, *args, **kwargs)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(limit)
+        return result, report.getvalue()
+
+    if mode == "sample":
+        import sys
+        import threading
+        from collections import Counter
+
+        samples = Counter()
+        target = threading.get_ident()
+        done = threading.Event()
+
+        def sampler():
+            while not done.wait(interval):
+                frame = sys._current_frames().get(target)
+                if frame is not None and not done.is_set():
+                    code = frame.f_code
+                    samples[f"{code.co_filename}:{frame.f_lineno} {code.co_name}"] += 1
+
+        thread = threading.Thread(target=sampler, daemon=True)
+        thread.start()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            done.set()
+            thread.join()
+        total = sum(samples.values()) or 1
+        report = [f"{count:>6} {count / total:>6.1%}  {location}" for location, count in samples.most_common(limit)]
+        return result, "\n".join([f"{sum(samples.values())} samples every {interval * 1000:g} ms"] + report) + "\n"
+
+    raise ValueError(f"Unknown profiling mode '{mode}'.")
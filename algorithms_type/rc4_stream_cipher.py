@@ -1,7 +1,27 @@
-def initialize_state_array(key: str) -> list:
+import threading
+from collections import OrderedDict
+
+from algorithms_type.buffers import byte_view, write_output
+from algorithms_type.instrumentation import instrumented
+from algorithms_type.streaming import STREAM_CHUNK_SIZE, iter_chunks
+
+KEYSTREAM_CACHE_BYTES = 16 << 20  # Default memory budget of the keystream cache
+
+
+def key_to_bytes(key) -> bytes:
+    """Convert a str or bytes-like key to key bytes; characters are taken modulo 256 as in the KSA."""
+    if isinstance(key, str):
+        return bytes(ord(char) & 0xff for char in key)
+    return bytes(key)
+
+
+@instrumented("rc4.initialize_state_array")
+def initialize_state_array(key) -> list:
     """Initialize the state array and perform key scheduling for RC4."""
     s = [i for i in range(256)]
-    key_list = [ord(char) for char in key]
+    key_list = list(key_to_bytes(key))
+    if not key_list:
+        raise ValueError("RC4 key cannot be empty.")
     t = key_list * (len(s) // len(key_list)) + key_list[:len(s) % len(key_list)]
 
     j = 0
@@ -10,37 +30,188 @@ def initialize_state_array(key: str) -> list:
         s[i], s[j] = s[j], s[i]
     return s
 
-def generate_keystream(length: int, s: list) -> list:
-    """Generate a keystream of the specified length for RC4."""
-    i = j = 0
-    keystream = []
-    for _ in range(length):
-        i = (i + 1) % 256
-        j = (j + s[i]) % 256
-        s[i], s[j] = s[j], s[i]
-        t = (s[i] + s[j]) % 256
-        keystream.append(s[t])
-    return keystream
 
-def encrypt_message_with_keystream(message: str, keystream: list) -> list:
-    """Encrypt the message using XOR with the keystream."""
-    ascii_values = [ord(char) for char in message]
-    encrypted_message = [msg_byte ^ key_byte for msg_byte, key_byte in zip(ascii_values, keystream)]
-    return encrypted_message
+def xor_buffers(data, keystream) -> bytes:
+    """XOR two equal-length buffers in one big-integer operation."""
+    result = int.from_bytes(data, 'big') ^ int.from_bytes(keystream, 'big')
+    return result.to_bytes(len(data), 'big')
+
+
+class RC4:
+    """
+    Incremental RC4 cipher.
+
+    The S-box lives in a 256-byte bytearray and i/j persist between calls, so a message
+    can be fed through `update` in chunks of any size; the concatenated output equals
+    encrypting the whole message at once. Encryption and decryption are the same operation.
+    """
+
+    __slots__ = ("state", "i", "j")
+
+    def __init__(self, key):
+        self.state = bytearray(initialize_state_array(key))
+        self.i = 0
+        self.j = 0
+
+    @instrumented("rc4.keystream", size=lambda self, length: length)
+    def keystream(self, length: int) -> bytearray:
+        """Generate the next `length` keystream bytes."""
+        s = self.state
+        i, j = self.i, self.j
+        keystream = bytearray(length)
+        for k in range(length):
+            i = (i + 1) & 0xff
+            si = s[i]
+            j = (j + si) & 0xff
+            sj = s[j]
+            s[i] = sj
+            s[j] = si
+            keystream[k] = s[(si + sj) & 0xff]
+        self.i, self.j = i, j
+        return keystream
+
+    def update(self, data) -> bytes:
+        """Encrypt the next chunk of a bytes-like message."""
+        data = memoryview(data).cast('B')
+        return xor_buffers(data, self.keystream(len(data)))
+
+
+class RC4KeystreamCache:
+    """
+    LRU cache of RC4 keystreams keyed by key.
+
+    Each entry holds the longest keystream prefix generated so far for a key and the
+    cipher state (the post-KSA S-box advanced to the end of that prefix), so a repeated
+    key skips the KSA and only generates keystream beyond the cached prefix. Entries are
+    evicted least recently used first once the cached bytes exceed `max_bytes`; requests
+    longer than the budget bypass the cache.
+    """
+
+    ENTRY_OVERHEAD = 256  # S-box bytes held per entry
+
+    def __init__(self, max_bytes=KEYSTREAM_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key bytes -> (RC4 positioned after prefix, prefix bytearray)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0  # Key cached and prefix long enough
+        self.partial_hits = 0  # Key cached, prefix extended
+        self.misses = 0
+        self.evictions = 0
 
-def convert_to_hex(encrypted_message: list) -> str:
+    def keystream(self, key, length: int) -> bytes:
+        """Return the first `length` keystream bytes for key."""
+        key_bytes = key_to_bytes(key)
+        with self._lock:
+            entry = self._entries.get(key_bytes)
+            if length + self.ENTRY_OVERHEAD > self.max_bytes:
+                self.misses += 1
+                return bytes(RC4(key_bytes).keystream(length))
+
+            if entry is None:
+                self.misses += 1
+                entry = (RC4(key_bytes), bytearray())
+                self._entries[key_bytes] = entry
+                self._size += self.ENTRY_OVERHEAD
+            elif len(entry[1]) >= length:
+                self.hits += 1
+            else:
+                self.partial_hits += 1
+            self._entries.move_to_end(key_bytes)
+
+            cipher, prefix = entry
+            if len(prefix) < length:
+                missing = length - len(prefix)
+                prefix += cipher.keystream(missing)
+                self._size += missing
+            with memoryview(prefix) as view:
+                keystream = view[:length].tobytes()  # One copy, where bytes(prefix[:length]) makes two
+            self._evict()
+            return keystream
+
+    def _evict(self):
+        # The most recently used entry is never evicted, and always fits the budget
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            _, (_, prefix) = self._entries.popitem(last=False)
+            self._size -= len(prefix) + self.ENTRY_OVERHEAD
+            self.evictions += 1
+
+    def encrypt(self, data, key) -> bytes:
+        """Encrypt a bytes-like message from the start of key's keystream."""
+        data = memoryview(data).cast('B')
+        return xor_buffers(data, self.keystream(key, len(data)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counters and memory use."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "partial_hits": self.partial_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+KEYSTREAM_CACHE = RC4KeystreamCache()
+
+
+def encrypt_stream(source, sink, key, chunk_size=STREAM_CHUNK_SIZE) -> int:
+    """
+    Encrypt a binary file-like source into sink chunk by chunk with constant memory.
+
+    Returns the number of bytes written.
+    """
+    cipher = RC4(key)
+    total = 0
+    for chunk in iter_chunks(source, chunk_size):
+        sink.write(cipher.update(chunk))
+        total += len(chunk)
+    return total
+
+
+def rc4_encrypt_into(data, key, out=None, cache=KEYSTREAM_CACHE) -> memoryview:
+    """
+    Encrypt the bytes of any buffer-protocol object from the start of key's keystream.
+
+    The result is written into `out` if given; returns a view of the bytes written (of a
+    new buffer when out is None).
+    """
+    view = byte_view(data)
+    if cache is None:
+        keystream = RC4(key).keystream(len(view))
+    else:
+        keystream = cache.keystream(key, len(view))
+    return write_output(xor_buffers(view, keystream), out)
+
+
+@instrumented("rc4.encode_output", size=len)
+def convert_to_hex(encrypted_message) -> str:
     """Convert the encrypted message to a hex string for display."""
-    return ' '.join(format(val, '02x') for val in encrypted_message)
+    return bytes(encrypted_message).hex(' ')
+
 
-def rc4_encryption(message: str, key: str) -> str:
-    """Main RC4 encryption function."""
-    s = initialize_state_array(key)
-    keystream = generate_keystream(len(message), s)
-    encrypted_message = encrypt_message_with_keystream(message, keystream)
+def rc4_encryption(message: str, key: str, cache=KEYSTREAM_CACHE) -> str:
+    """
+    Main RC4 encryption function; keystreams are reused from cache when one is given.
+
+    The message is encrypted as UTF-8, so each character from U+0080 up takes two or more
+    bytes (before the bytes engine, characters up to U+00FF took one).
+    """
+    if cache is None:
+        encrypted_message = RC4(key).update(message.encode())
+    else:
+        encrypted_message = cache.encrypt(message.encode(), key)
     return convert_to_hex(encrypted_message)
 
 
 def rc4_main(message: str, key: str) -> str:
     """Encrypt a message using RC4 Stream Cipher."""
     return rc4_encryption(message, key)
-
@@ -1,16 +1,133 @@
 import base64
-from sympy import isprime, randprime
+import hashlib
+import secrets
+from typing import NamedTuple
 
+from algorithms_type.buffers import byte_view, output_view
+from algorithms_type.instrumentation import instrumented
+
+PUBLIC_EXPONENT = 65537
+
+
+class RSAPrivateKey(NamedTuple):
+    """RSA private key with the CRT parameters used for fast private-key operations."""
+    n: int
+    e: int
+    d: int
+    p: int
+    q: int
+    dp: int  # d mod (p - 1)
+    dq: int  # d mod (q - 1)
+    qinv: int  # q^-1 mod p
+
+    @property
+    def public_key(self) -> tuple:
+        return self.e, self.n
+
+    @property
+    def private_key(self) -> tuple:
+        return self.d, self.n
+
+
+def sieve_small_primes(limit: int) -> list:
+    """Return all primes below limit using the sieve of Eratosthenes."""
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b'\x00\x00'
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i, is_prime in enumerate(sieve) if is_prime]
+
+
+SMALL_PRIMES = sieve_small_primes(2048)[1:]  # Odd primes used to pre-screen candidates
+PRIME_SEARCH_WINDOW = 4096  # Odd candidates examined per random starting point
+
+
+def miller_rabin_rounds(bits: int) -> int:
+    """Number of Miller-Rabin rounds for an error probability below 2^-100 on random candidates."""
+    if bits >= 1536:
+        return 4
+    if bits >= 1024:
+        return 5
+    if bits >= 512:
+        return 8
+    return 40
+
+
+def is_probable_prime(n: int, rounds: int = None) -> bool:
+    """Miller-Rabin probabilistic primality test, preceded by trial division by small primes."""
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES[:64]:
+        if n % p == 0:
+            return n == p
+    if n == 2:
+        return True
+    if n % 2 == 0:
+        return False
+
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+
+    for _ in range(rounds or miller_rabin_rounds(n.bit_length())):
+        x = pow(secrets.randbelow(n - 3) + 2, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def generate_prime(bits: int) -> int:
+    """
+    Generate a random prime of exactly 'bits' bits with the top two bits set.
+
+    Starting from a random odd number, the next PRIME_SEARCH_WINDOW odd candidates are
+    sieved against SMALL_PRIMES with slice assignments, so only survivors reach the
+    Miller-Rabin modexps. Setting the top two bits makes a product of two such primes
+    exactly twice as long.
+    """
+    if bits < 16:
+        raise ValueError("Prime size must be at least 16 bits.")
+
+    while True:
+        start = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+        # Entry k of the window is the candidate start + 2k
+        window = bytearray([1]) * PRIME_SEARCH_WINDOW
+        for p in SMALL_PRIMES:
+            # Smallest k with start + 2k divisible by p
+            first = (-start * ((p + 1) // 2)) % p
+            window[first::p] = bytes(len(range(first, PRIME_SEARCH_WINDOW, p)))
+
+        for k in range(PRIME_SEARCH_WINDOW):
+            if window[k]:
+                candidate = start + 2 * k
+                if candidate.bit_length() != bits:
+                    break
+                if is_probable_prime(candidate):
+                    return candidate
+
+
+@instrumented("rsa.generate_large_prime")
 def generate_large_prime(bits=512):
-    """Generate a random prime number of approximately 'bits' bits."""
+    """Generate a random prime number of 'bits' bits."""
+    return generate_prime(bits)
+
+
+def generate_large_prime_sympy(bits=512):
+    """Generate a random prime number of approximately 'bits' bits with sympy (reference path)."""
+    from sympy import randprime  # Imported on first use; sympy is slow to import
+
     lower_bound = 2**(bits - 1)
     upper_bound = 2**bits - 1
     return randprime(lower_bound, upper_bound)
 
-prime = generate_large_prime()
-# print("Generated Prime:", prime)
-
-
 def is_coprime(a: int, b: int) -> bool:
     """Check if two numbers are coprime."""
     while b:
@@ -20,6 +137,7 @@ def is_coprime(a: int, b: int) -> bool:
 def mod_inverse(e: int, phi: int) -> int:
     """Compute the modular multiplicative inverse of e modulo phi."""
     original_phi = phi
+    e %= phi
     x0, x1 = 0, 1
     while e > 1:
         q = e // phi
@@ -29,19 +147,68 @@ def mod_inverse(e: int, phi: int) -> int:
         x1 += original_phi
     return x1
 
+def generate_rsa_key(bits=1024, e=PUBLIC_EXPONENT, prime_generator=generate_large_prime) -> RSAPrivateKey:
+    """Generate an RSA key with a fixed public exponent and precomputed CRT parameters."""
+    prime_bits = bits // 2
+    p = prime_generator(prime_bits)  # Generate first prime
+    while not is_coprime(p - 1, e):
+        p = prime_generator(prime_bits)
+    q = prime_generator(bits - prime_bits)  # Generate second prime
+    while q == p or not is_coprime(q - 1, e):
+        q = prime_generator(bits - prime_bits)
+
+    n = p * q
+    d = mod_inverse(e, (p - 1) * (q - 1))
+    return RSAPrivateKey(n, e, d, p, q, d % (p - 1), d % (q - 1), mod_inverse(q, p))
+
+
 def generate_keys() -> tuple:
     """Generate RSA public and private keys."""
-    p = generate_large_prime()  # Generate first prime
-    q = generate_large_prime()  # Generate second prime
-    n = p * q
-    phi = (p - 1) * (q - 1)
-    e = next((i for i in range(2, phi) if is_coprime(phi, i)), None)
-    if e is None:
-        raise ValueError("No suitable public exponent found.")
+    key = generate_rsa_key()
+    return key.public_key, key.private_key  # Return public and private keys
+
+
+def format_private_key(key: RSAPrivateKey) -> str:
+    """The full private key as comma-separated integers in field order (n, e, d, p, q, dp, dq, qinv)."""
+    return ",".join(str(value) for value in key)
+
+
+def parse_private_key(text: str) -> RSAPrivateKey:
+    """Parse a key written by `format_private_key`."""
+    values = [int(value) for value in text.split(",")]
+    if len(values) != len(RSAPrivateKey._fields):
+        raise ValueError(f"RSA private key needs {len(RSAPrivateKey._fields)} comma-separated integers.")
+    key = RSAPrivateKey(*values)
+    if key.p * key.q != key.n:
+        raise ValueError("Invalid RSA private key: p * q != n.")
+    return key
 
-    d = mod_inverse(e, phi)
-    return (e, n), (d, n)  # Return public and private keys
 
+@instrumented("rsa.decrypt_modexp")
+def rsa_decrypt_int(c: int, key: RSAPrivateKey) -> int:
+    """Apply the private-key operation c^d mod n using the Chinese Remainder Theorem."""
+    m1 = pow(c % key.p, key.dp, key.p)
+    m2 = pow(c % key.q, key.dq, key.q)
+    h = key.qinv * (m1 - m2) % key.p
+    return m2 + h * key.q
+
+
+def message_digest(message: bytes) -> int:
+    """Hash a message to the integer that gets signed."""
+    return int.from_bytes(hashlib.sha256(message).digest(), 'big')
+
+
+def sign_message(message: bytes, key: RSAPrivateKey) -> int:
+    """Sign the SHA-256 digest of a message with the CRT private-key operation."""
+    return rsa_decrypt_int(message_digest(message) % key.n, key)
+
+
+def verify_signature(message: bytes, signature: int, public_key: tuple) -> bool:
+    """Check a signature produced by `sign_message` against the (e, n) public key."""
+    e, n = public_key
+    return pow(signature, e, n) == message_digest(message) % n
+
+@instrumented("rsa.encrypt_modexp", size=lambda message, *args: len(message.encode()))
 def encrypt_message(message: str, public_key: tuple) -> list:
     """Encrypt message using the RSA public key."""
     e, n = public_key
@@ -49,6 +216,11 @@ def encrypt_message(message: str, public_key: tuple) -> list:
     encrypted_values = [pow(val, e, n) for val in ascii_values]
     return encrypted_values
 
+def decrypt_message(encrypted_values: list, key: RSAPrivateKey) -> str:
+    """Decrypt per-character RSA values back into the message."""
+    return ''.join(chr(rsa_decrypt_int(val, key)) for val in encrypted_values)
+
+@instrumented("rsa.encode_output")
 def encode_to_base64(encrypted_values: list) -> str:
     """Convert the entire list of encrypted integers to a single Base64 string."""
     byte_data = b''.join(val.to_bytes((val.bit_length() + 7) // 8, 'big') for val in encrypted_values)
@@ -56,22 +228,141 @@ def encode_to_base64(encrypted_values: list) -> str:
     return base64_encoded
 
 
-def rsa_encryption(message: str) -> tuple:
-    """Encrypt a message using RSA."""
-    public_key, private_key = generate_keys()
+def packed_block_sizes(n: int) -> tuple:
+    """Return (plaintext, ciphertext) block sizes in bytes for packed mode under modulus n."""
+    cipher_size = (n.bit_length() + 7) // 8
+    return cipher_size - 1, cipher_size  # One byte short of the modulus keeps every block below n
+
+
+@instrumented("rsa.encrypt_modexp", size=lambda data, *args, **kwargs: len(data))
+def encrypt_bytes_packed(data: bytes, public_key: tuple, final=True) -> bytes:
+    """
+    Encrypt bytes with as many message bytes per RSA block as the modulus allows.
+
+    The data is padded with 0x80 followed by zeros to a whole number of blocks, and every
+    ciphertext block is written at the full modulus width, so no length list is needed.
+    For streaming, earlier parts can be passed with final=False; they are not padded and
+    must be a whole number of plaintext blocks.
+    """
+    e, n = public_key
+    plain_size, cipher_size = packed_block_sizes(n)
+    if final:
+        padded = bytes(data) + b'\x80' + bytes(-(len(data) + 1) % plain_size)
+    elif len(data) % plain_size:
+        raise ValueError("Non-final packed input must be a whole number of plaintext blocks.")
+    else:
+        padded = bytes(data)
+    return b''.join(
+        pow(int.from_bytes(padded[i:i + plain_size], 'big'), e, n).to_bytes(cipher_size, 'big')
+        for i in range(0, len(padded), plain_size)
+    )
+
+
+def rsa_encrypted_size(length: int, n: int) -> int:
+    """Size of the packed ciphertext of `length` plaintext bytes under modulus n."""
+    plain_size, cipher_size = packed_block_sizes(n)
+    return (length // plain_size + 1) * cipher_size
+
+
+@instrumented("rsa.encrypt_modexp", size=lambda data, *args, **kwargs: len(byte_view(data)))
+def rsa_encrypt_into(data, public_key: tuple, out=None) -> memoryview:
+    """
+    Packed RSA encryption (as `encrypt_bytes_packed`) of any buffer-protocol object.
+
+    Plaintext blocks are read from the input without copying, and each ciphertext block
+    is written into `out` (a new buffer when None; see `rsa_encrypted_size`). Returns a
+    view of the ciphertext.
+    """
+    e, n = public_key
+    plain_size, cipher_size = packed_block_sizes(n)
+    view = byte_view(data)
+    full = len(view) - len(view) % plain_size
+    size = rsa_encrypted_size(len(view), n)
+    out = output_view(out, size)
+
+    position = 0
+    for i in range(0, full, plain_size):
+        block = int.from_bytes(view[i:i + plain_size], 'big')
+        out[position:position + cipher_size] = pow(block, e, n).to_bytes(cipher_size, 'big')
+        position += cipher_size
+    last = view[full:].tobytes() + b'\x80' + bytes(plain_size - 1 - (len(view) - full))
+    out[position:size] = pow(int.from_bytes(last, 'big'), e, n).to_bytes(cipher_size, 'big')
+    return out[:size]
+
+
+def decrypt_bytes_packed(data: bytes, key: RSAPrivateKey) -> bytes:
+    """Decrypt bytes produced by `encrypt_bytes_packed` using the CRT private key."""
+    plain_size, cipher_size = packed_block_sizes(key.n)
+    if not data or len(data) % cipher_size:
+        raise ValueError("Packed ciphertext length must be a non-zero multiple of the block size.")
+
+    padded = b''.join(
+        rsa_decrypt_int(int.from_bytes(data[i:i + cipher_size], 'big'), key).to_bytes(plain_size, 'big')
+        for i in range(0, len(data), cipher_size)
+    )
+    unpadded = padded.rstrip(b'\x00')
+    if not unpadded.endswith(b'\x80'):
+        raise ValueError("Invalid packed RSA padding.")
+    return unpadded[:-1]
+
+
+def decode_from_base64(base64_encoded: str, byte_lengths: list) -> list:
+    """Split a Base64 string produced by `encode_to_base64` back into integers."""
+    byte_data = base64.b64decode(base64_encoded)
+    values = []
+    offset = 0
+    for length in byte_lengths:
+        values.append(int.from_bytes(byte_data[offset:offset + length], 'big'))
+        offset += length
+    return values
+
+
+def rsa_encryption(message: str, keys: tuple = None) -> tuple:
+    """Encrypt a message using RSA, with the given (public_key, private_key) pair or a fresh one."""
+    public_key, private_key = keys or generate_keys()
     encrypted_message = encrypt_message(message, public_key)
     byte_lengths = [(val.bit_length() + 7) // 8 for val in encrypted_message]
     base64_encoded = encode_to_base64(encrypted_message)
     return base64_encoded, byte_lengths, private_key
 
 
-def rsa_main(message: str) -> dict:
-    """Encrypt a message using RSA and return encrypted message along with keys."""
-    public_key, private_key = generate_keys()  # Generate keys
-    encrypted_message, byte_lengths, _ = rsa_encryption(message)
+def rsa_main(message: str, key_pool=None) -> dict:
+    """
+    Encrypt a message using RSA and return encrypted message along with keys.
+
+    With a key pool (see `rsa_key_pool.RSAKeyPool`) the keypair is taken from the pool
+    instead of being generated on the request path.
+    """
+    key = key_pool.get() if key_pool is not None else generate_rsa_key()
+    public_key, private_key = key.public_key, key.private_key
+    encrypted_message, byte_lengths, _ = rsa_encryption(message, (public_key, private_key))
     return {
         "encrypted_message": encrypted_message,
         "public_key": public_key,
         "private_key": private_key,
-        "byte_lengths": byte_lengths
+        "byte_lengths": byte_lengths,
+        "key": key
     }
+
+
+def rsa_decryption(encrypted_message: str, byte_lengths: list, key: RSAPrivateKey) -> str:
+    """Decrypt a Base64 message produced by `rsa_main` using the CRT private key."""
+    return decrypt_message(decode_from_base64(encrypted_message, byte_lengths), key)
+
+
+def rsa_packed_main(message: str, key_pool=None) -> dict:
+    """Encrypt a message using packed RSA blocks and return it Base64-encoded along with keys."""
+    key = key_pool.get() if key_pool is not None else generate_rsa_key()
+    encrypted_message = encrypt_bytes_packed(message.encode(), key.public_key)
+    return {
+        "encrypted_message": base64.b64encode(encrypted_message).decode('utf-8'),
+        "public_key": key.public_key,
+        "private_key": key.private_key,
+        "block_size": packed_block_sizes(key.n)[1],
+        "key": key
+    }
+
+
+def rsa_packed_decryption(encrypted_message: str, key: RSAPrivateKey) -> str:
+    """Decrypt a Base64 message produced by `rsa_packed_main`."""
+    return decrypt_bytes_packed(base64.b64decode(encrypted_message), key).decode()
@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import deque
+
+from algorithms_type.rsa import generate_rsa_key
+
+
+class RSAKeyPool:
+    """
+    A pool of pre-generated RSA keys kept filled to `depth` by a background thread.
+
+    `get` pops a ready keypair in O(1); only when the pool has run dry does it generate
+    one inline. Pass an executor (e.g. a `ProcessPoolExecutor`) to run key generation
+    outside this process, so refills do not compete with the caller for the GIL; the
+    key factory must then be picklable.
+    """
+
+    def __init__(self, depth=4, key_factory=generate_rsa_key, executor=None, start=True):
+        if depth < 1:
+            raise ValueError("Key pool depth must be at least 1.")
+
+        self.depth = depth
+        self.key_factory = key_factory
+        self.executor = executor
+        self._keys = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "keys_generated": 0,
+            "refill_errors": 0,
+            "refill_seconds_total": 0.0,
+            "last_refill_seconds": 0.0,
+        }
+
+        if start:
+            self.start()
+
+    def start(self):
+        """Start the background refill thread (no-op if it is already running)."""
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._refill_loop, name="rsa-key-pool", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop refilling; keys already in the pool can still be taken."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def get(self):
+        """Return a keypair from the pool, generating one inline if the pool is empty."""
+        with self._condition:
+            if self._keys:
+                self._metrics["hits"] += 1
+                keys = self._keys.popleft()
+                self._condition.notify_all()  # Wake the refill thread
+                return keys
+            self._metrics["misses"] += 1
+        return self._generate()
+
+    def _generate(self):
+        """Generate one keypair, in the executor if there is one, and record its latency."""
+        start = time.perf_counter()
+        if self.executor is not None:
+            keys = self.executor.submit(self.key_factory).result()
+        else:
+            keys = self.key_factory()
+        elapsed = time.perf_counter() - start
+
+        with self._condition:
+            self._metrics["keys_generated"] += 1
+            self._metrics["refill_seconds_total"] += elapsed
+            self._metrics["last_refill_seconds"] = elapsed
+        return keys
+
+    def _refill_loop(self):
+        while True:
+            with self._condition:
+                while not self._stopped and len(self._keys) >= self.depth:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+
+            try:
+                keys = self._generate()
+            except Exception:
+                with self._condition:
+                    self._metrics["refill_errors"] += 1
+                time.sleep(0.1)  # Avoid spinning on a persistently failing factory
+                continue
+
+            with self._condition:
+                self._keys.append(keys)
+                self._condition.notify_all()
+
+    def wait_until_full(self, timeout=None) -> bool:
+        """Block until the pool holds `depth` keypairs; returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self._keys) >= self.depth, timeout)
+
+    def get_metrics(self) -> dict:
+        """Return a snapshot of the pool size and refill/hit metrics."""
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics["size"] = len(self._keys)
+            metrics["depth"] = self.depth
+        generated = metrics["keys_generated"]
+        metrics["mean_refill_seconds"] = metrics["refill_seconds_total"] / generated if generated else 0.0
+        return metrics
@@ -0,0 +1,20 @@
+STREAM_CHUNK_SIZE = 1 << 16  # Characters (or bytes) read per step from file-like sources
+
+
+def iter_chunks(source, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield non-empty chunks from a file-like object or an iterable of chunks.
+
+    Objects with a `read` method are read `chunk_size` at a time; anything else is
+    iterated as-is.
+    """
+    if hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        for chunk in source:
+            if chunk:
+                yield chunk
@@ -0,0 +1,25 @@
+class CharacterTable(dict):
+    """
+    A `str.translate` table that computes each character's mapping on first use.
+
+    `mapper` takes a character and returns its replacement string, or None to delete it.
+    Results are memoized in the dict itself, so every distinct character is mapped once.
+    """
+
+    def __init__(self, mapper):
+        super().__init__()
+        self.mapper = mapper
+
+    def __missing__(self, code: int):
+        value = self.mapper(chr(code))
+        self[code] = value
+        return value
+
+
+def alpha_only(char: str):
+    """CharacterTable mapper that keeps alphabetic characters and deletes the rest."""
+    return char if char.isalpha() else None
+
+
+ALPHA_ONLY_TABLE = CharacterTable(alpha_only)
+NON_ALPHA_BYTES = bytes(b for b in range(256) if not bytes([b]).isalpha())
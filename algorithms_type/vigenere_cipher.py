@@ -1,3 +1,13 @@
+from functools import lru_cache
+
+from algorithms_type.buffers import byte_view, output_view, write_output
+from algorithms_type.instrumentation import instrumented
+from algorithms_type.streaming import STREAM_CHUNK_SIZE, iter_chunks
+from algorithms_type.translation import ALPHA_ONLY_TABLE, NON_ALPHA_BYTES, CharacterTable
+
+SEGMENT_SIZE = 1 << 16  # Approximate characters encrypted per segment
+
+
 def match_key_length(message: str, key: str) -> str:
     """Extend the key to match the length of the message."""
     return key * (len(message) // len(key)) + key[:len(message) % len(key)]
@@ -13,23 +23,114 @@ def encrypt_character(char: str, key_char: str, CHAR_RANGE: int = 26) -> str:
     return chr(final_char_code)
 
 
+@lru_cache(maxsize=1024)
+def vigenere_table(key_char: str) -> CharacterTable:
+    """Memoized translation table encrypting alphabetic characters under one key character."""
+    return CharacterTable(lambda char: encrypt_character(char, key_char) if char.isalpha() else char)
+
+
+@lru_cache(maxsize=1024)
+def vigenere_byte_table(key_char: str) -> bytes:
+    """`bytes.translate` table encrypting ASCII letters under one key character."""
+    return bytes(
+        ord(encrypt_character(chr(b), key_char)) if b < 128 and chr(b).isalpha() else b
+        for b in range(256)
+    )
+
+
+def encrypt_bytes_into(view: memoryview, key: str, out: memoryview) -> None:
+    """Encrypt a byte view into out; each key position's strided slice is translated straight into place."""
+    size = len(view)
+    key_length = len(key)
+    for r in range(min(key_length, size)):
+        out[r:size:key_length] = view[r::key_length].tobytes().translate(vigenere_byte_table(key[r]))
+
+
+def encrypt_segment(segment: str, key: str) -> str:
+    """
+    Encrypt a segment whose first character lines up with the first key character.
+
+    The characters at positions r, r + len(key), ... all use key[r], so each of those
+    strided slices is translated with key[r]'s table and written back in place.
+    Non-alphabetic characters pass through unchanged.
+    """
+    key_length = len(key)
+    if segment.isascii():
+        result = bytearray(len(segment))
+        encrypt_bytes_into(memoryview(segment.encode('ascii')), key, memoryview(result))
+        return result.decode('ascii')
+
+    result = [''] * len(segment)
+    for r in range(min(key_length, len(segment))):
+        result[r::key_length] = segment[r::key_length].translate(vigenere_table(key[r]))
+    return ''.join(result)
+
+
+def remove_special_chars(text: str) -> str:
+    """Drop every non-alphabetic character."""
+    if text.isascii():
+        return text.encode('ascii').translate(None, NON_ALPHA_BYTES).decode('ascii')
+    return text.translate(ALPHA_ONLY_TABLE)
+
+
+@instrumented("vigenere.translate", size=lambda message, *args: len(message.encode()))
 def vigenere_encryption(message: str, key: str, include_special_chars: bool) -> str:
     """Encrypt a message using the Vigenere cipher with optional inclusion of special characters."""
-    CHAR_RANGE = 26
-    result = ''
-
-    # Match the key length to the message length
-    new_key = match_key_length(message, key)
+    if not key:
+        raise ValueError("Vigenere key cannot be empty.")
 
-    for i in range(len(message)):
-        if message[i].isalpha():
-            result += encrypt_character(message[i], new_key[i], CHAR_RANGE)
-        else:
-            if include_special_chars:
-                result += message[i]
+    # The key advances on every character, so whole multiples of the key length keep segments aligned
+    step = len(key) * max(1, SEGMENT_SIZE // len(key))
+    result = ''.join(encrypt_segment(message[i:i + step], key) for i in range(0, len(message), step))
 
+    if not include_special_chars:
+        result = remove_special_chars(result)
     return result
 
+@instrumented("vigenere.translate", size=lambda data, *args, **kwargs: len(byte_view(data)))
+def vigenere_encrypt_into(data, key: str, include_special_chars: bool, out=None) -> memoryview:
+    """
+    Encrypt the bytes of any buffer-protocol object, writing into `out` if given.
+
+    As in `vigenere_encryption`, the key advances on every byte; only ASCII letters are
+    encrypted, and other bytes are kept or, without special characters, dropped. Returns
+    a view of the bytes written (of a new buffer when out is None).
+    """
+    if not key:
+        raise ValueError("Vigenere key cannot be empty.")
+
+    view = byte_view(data)
+    if not include_special_chars:
+        # The kept letters are only known after encryption, so encrypt into scratch space first
+        scratch = bytearray(len(view))
+        encrypt_bytes_into(view, key, memoryview(scratch))
+        return write_output(scratch.translate(None, NON_ALPHA_BYTES), out)
+
+    out = output_view(out, len(view))
+    encrypt_bytes_into(view, key, out)
+    return out[:len(view)]
+
+
+def vigenere_stream(source, key: str, include_special_chars: bool, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Encrypt a file-like object or iterable of text chunks, yielding encrypted chunks.
+
+    The key position advances on every input character, skipped ones included, exactly as
+    in `vigenere_encryption`; each chunk is encrypted with the key rotated to the position
+    where the previous chunk stopped, so the joined output equals the one-shot result.
+    """
+    if not key:
+        raise ValueError("Vigenere key cannot be empty.")
+
+    position = 0
+    for chunk in iter_chunks(source, chunk_size):
+        offset = position % len(key)
+        encrypted_chunk = vigenere_encryption(chunk, key[offset:] + key[:offset], include_special_chars)
+        position += len(chunk)
+        if encrypted_chunk:
+            yield encrypted_chunk
+
+
 def vigenere_main(message: str, key: str, include_special_chars: bool) -> str:
     """Encrypt a message using the Vigenère cipher."""
     return vigenere_encryption(message, key, include_special_chars)
@@ -0,0 +1,259 @@
+"""
+Asyncio front end for AlgorithmSelector, plus a local line-delimited JSON server.
+
+Run the server from the repository root:
+
+    python -m async_service --host 127.0.0.1 --port 8765
+
+Each request is one JSON line, e.g. {"id": 1, "algorithm": "Caesar Cipher",
+"message": "hello", "key": 3, "include_special_chars": true}, and each response is one
+JSON line with the same "id" and either "result" or "error".
+"""
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from algorithms import AlgorithmSelector
+from registry import get_algorithm
+
+BATCH_WINDOW = 0.005  # Seconds a batch stays open for more requests with the same key
+MAX_BATCH_SIZE = 256
+MAX_QUEUE_SIZE = 1024  # Requests waiting for dispatch before callers are made to wait
+MAX_IN_FLIGHT_BATCHES = 8
+
+
+def run_batch(algorithm_name, messages, key, include_special_chars) -> list:
+    """
+    Executor entry point: encrypt a batch and return one response dict per message.
+
+    Module-level, with its own selector per batch, so it works with thread and process
+    pools alike. Batches that share generated keys report the batch key with every message.
+    """
+    selector = AlgorithmSelector()
+    results = selector.run_many(algorithm_name, messages, key, include_special_chars, executor="inline")
+    spec = get_algorithm(algorithm_name)
+    metadata = selector.generated_metadata.get(algorithm_name) if spec.generated_key else None
+
+    responses = []
+    for i, item in enumerate(results):
+        if item.error is not None:
+            responses.append({"error": f"{type(item.error).__name__}: {item.error}"})
+            continue
+        response = {"encrypted_message": item.result}
+        if metadata is not None:
+            response.update(spec.batch_response(metadata, i))
+        responses.append(response)
+    return responses
+
+
+def fail_closed(future) -> None:
+    if not future.done():
+        future.set_exception(RuntimeError("The service was closed before the request was run."))
+
+
+class AsyncAlgorithmSelector:
+    """
+    Non-blocking front end that coalesces concurrent requests into `run_many` batches.
+
+    Requests for the same algorithm, key and special-character flag that arrive within
+    `batch_window` seconds of each other are encrypted together in `executor` (a thread
+    pool by default; a process pool also works). Algorithms that generate their own keys
+    (AES, RSA) are never coalesced, so no two callers share key material. At most
+    `max_queue_size` requests wait for dispatch and `max_in_flight_batches` batches run
+    at once; beyond that, `encrypt` callers wait, which propagates backpressure to them.
+    """
+
+    def __init__(self, executor=None, batch_window=BATCH_WINDOW, max_batch_size=MAX_BATCH_SIZE,
+                 max_queue_size=MAX_QUEUE_SIZE, max_in_flight_batches=MAX_IN_FLIGHT_BATCHES):
+        self.executor = executor or ThreadPoolExecutor()
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._queue = asyncio.Queue(max_queue_size)
+        self._in_flight = asyncio.Semaphore(max_in_flight_batches)
+        self._dispatcher = None
+        self._batch_tasks = set()
+        self.batches_run = 0
+        self.requests_run = 0
+
+    async def start(self):
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self):
+        """
+        Stop dispatching; batches already running are allowed to finish.
+
+        Requests that have not reached a batch yet, queued or waiting for queue space,
+        fail with RuntimeError, so no caller is left waiting.
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        while not self._queue.empty():
+            while not self._queue.empty():
+                _, _, future = self._queue.get_nowait()
+                fail_closed(future)
+            await asyncio.sleep(0)  # Callers waiting for queue space put their requests now
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def encrypt(self, algorithm_name, message, key=None, include_special_chars=None) -> dict:
+        """Encrypt one message; returns a dict with "encrypted_message" and any generated key material."""
+        if not isinstance(algorithm_name, str):
+            raise ValueError("Algorithm name must be a string.")
+        if key is not None and not isinstance(key, (int, str)):
+            raise ValueError("Key must be an integer, a string or null.")
+        if include_special_chars is not None and not isinstance(include_special_chars, bool):
+            raise ValueError("include_special_chars must be a boolean or null.")
+        # Requests with generated keys get a group of their own, flushed without waiting
+        token = object() if get_algorithm(algorithm_name).generated_key else None
+
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((algorithm_name, key, include_special_chars, token), message, future))
+        response = await future
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response
+
+    async def run_algorithm(self, algorithm_name, message, key=None, include_special_chars=None) -> str:
+        """Async counterpart of `AlgorithmSelector.run_algorithm`."""
+        response = await self.encrypt(algorithm_name, message, key, include_special_chars)
+        return response["encrypted_message"]
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        pending = {}  # batch group -> list of (message, future)
+        deadlines = {}  # batch group -> loop time at which it is flushed
+
+        try:
+            await self._dispatch_loop(loop, pending, deadlines)
+        finally:
+            for items in pending.values():
+                for _, future in items:
+                    fail_closed(future)
+
+    async def _dispatch_loop(self, loop, pending, deadlines):
+        while True:
+            timeout = max(0.0, min(deadlines.values()) - loop.time()) if deadlines else None
+            try:
+                group, message, future = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                try:
+                    if group not in pending:
+                        pending[group] = []
+                        deadlines[group] = loop.time() + (self.batch_window if group[3] is None else 0.0)
+                    pending[group].append((message, future))
+                    if len(pending[group]) >= self.max_batch_size:
+                        deadlines[group] = loop.time()
+                except Exception as e:  # A malformed request fails on its own; the dispatcher keeps running
+                    if not future.done():
+                        future.set_exception(e)
+
+            now = loop.time()
+            for group in [g for g, deadline in deadlines.items() if deadline <= now]:
+                del deadlines[group]
+                await self._in_flight.acquire()
+                task = asyncio.create_task(self._run_batch(group, pending.pop(group)))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, group, items):
+        algorithm_name, key, include_special_chars, _ = group
+        try:
+            responses = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                partial(run_batch, algorithm_name, [message for message, _ in items], key, include_special_chars),
+            )
+        except Exception as e:
+            responses = [{"error": f"{type(e).__name__}: {e}"}] * len(items)
+        finally:
+            self._in_flight.release()
+
+        self.batches_run += 1
+        self.requests_run += len(items)
+        for (_, future), response in zip(items, responses):
+            if not future.done():
+                future.set_result(response)
+
+
+async def handle_connection(service, reader, writer):
+    """Serve JSON-line requests on one connection; requests are handled concurrently."""
+    write_lock = asyncio.Lock()
+
+    async def respond(request):
+        try:
+            result = await service.encrypt(
+                request["algorithm"], request["message"], request.get("key"), request.get("include_special_chars")
+            )
+            response = {"id": request.get("id"), "result": result}
+        except Exception as e:
+            response = {"id": request.get("id"), "error": str(e)}
+        async with write_lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    tasks = set()
+    try:
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                async with write_lock:
+                    writer.write(json.dumps({"id": None, "error": f"Invalid JSON: {e}"}).encode() + b"\n")
+                    await writer.drain()
+                continue
+            if not isinstance(request, dict):
+                async with write_lock:
+                    writer.write(json.dumps({"id": None, "error": "Request must be a JSON object."}).encode() + b"\n")
+                    await writer.drain()
+                continue
+            task = asyncio.create_task(respond(request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=8765, **service_options):
+    """Run the JSON-line server until cancelled."""
+    async with AsyncAlgorithmSelector(**service_options) as service:
+        server = await asyncio.start_server(partial(handle_connection, service), host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve AlgorithmSelector over line-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW)
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-queue-size", type=int, default=MAX_QUEUE_SIZE)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, batch_window=args.batch_window,
+                          max_batch_size=args.max_batch_size, max_queue_size=args.max_queue_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare the scalar AES-CBC engine with the NumPy batch engine.
+
+Run from the repository root:
+
+    python -m benchmarks.aes_batch --message-size 64
+"""
+import argparse
+import os
+import time
+
+from algorithms_type.aes import aes_encrypt_batch, aes_encrypt_cbc, message_padding
+
+
+def time_call(func, repeat: int) -> float:
+    """Return the best wall-clock time of `repeat` calls to func."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(message_size: int, batch_sizes: list, repeat: int) -> None:
+    key = os.urandom(16)
+    crossover = None
+    aes_encrypt_batch([b""], key, [bytes(16)])  # Import NumPy and build its tables outside the timings
+
+    print(f"{'batch':>7} {'scalar msg/s':>14} {'batch msg/s':>14} {'speedup':>8}")
+    for batch_size in batch_sizes:
+        messages = [os.urandom(message_size) for _ in range(batch_size)]
+        ivs = [os.urandom(16) for _ in range(batch_size)]
+
+        def scalar():
+            for message, iv in zip(messages, ivs):
+                aes_encrypt_cbc(message_padding(message), key, iv)
+
+        def batch():
+            aes_encrypt_batch(messages, key, ivs)
+
+        scalar_time = time_call(scalar, repeat)
+        batch_time = time_call(batch, repeat)
+        speedup = scalar_time / batch_time
+        if crossover is None and speedup > 1:
+            crossover = batch_size
+        print(f"{batch_size:>7} {batch_size / scalar_time:>14.0f} {batch_size / batch_time:>14.0f} {speedup:>7.2f}x")
+
+    if crossover is None:
+        print("Vectorization did not win at any tested batch size.")
+    else:
+        print(f"Vectorization starts to win at a batch size of {crossover} ({message_size}-byte messages).")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--message-size", type=int, default=64, help="Bytes per message before padding.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64, 256, 1024, 4096])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.message_size, args.batch_sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
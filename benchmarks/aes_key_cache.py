@@ -0,0 +1,67 @@
+"""
+Measure the round key caches on a workload that reuses a pool of AES data keys.
+
+Run from the repository root:
+
+    python -m benchmarks.aes_key_cache --keys 300 --operations 20000
+
+Each operation encrypts (or decrypts) a short message under a randomly chosen key from
+the pool, once expanding the key every time and once through the LRU caches, then
+prints the cache hit rates.
+"""
+import argparse
+import os
+import random
+import time
+
+from algorithms_type import aes
+
+
+def run(keys: int, operations: int, key_size: int, message_size: int) -> None:
+    pool = [aes.generate_key(key_size) for _ in range(keys)]
+    choices = [random.choice(pool) for _ in range(operations)]
+    iv = aes.generate_iv()
+    message = aes.message_padding(os.urandom(message_size))
+
+    start = time.perf_counter()
+    for key in choices:
+        aes.cbc_encrypt_chunk(message, aes.key_schedule(key), iv)
+    uncached = time.perf_counter() - start
+
+    aes.clear_round_key_caches()
+    start = time.perf_counter()
+    for key in choices:
+        aes.aes_encrypt_cbc(message, key, iv)
+    cached = time.perf_counter() - start
+
+    ciphertext = aes.aes_encrypt_cbc(message, pool[0], iv)
+    start = time.perf_counter()
+    for key in choices:
+        aes.cbc_decrypt_chunk(ciphertext, aes.inverse_key_schedule(aes.key_schedule(key)), iv)
+    uncached_decrypt = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in choices:
+        aes.aes_decrypt_cbc(ciphertext, key, iv)
+    cached_decrypt = time.perf_counter() - start
+
+    print(f"AES-{key_size * 8}, {keys} keys, {operations} operations of {len(message)} bytes")
+    print(f"{'':>10} {'uncached ops/s':>15} {'cached ops/s':>13} {'speedup':>8}")
+    for name, before, after in (("encrypt", uncached, cached), ("decrypt", uncached_decrypt, cached_decrypt)):
+        print(f"{name:>10} {operations / before:>15.0f} {operations / after:>13.0f} {before / after:>7.2f}x")
+    for name, info in aes.round_key_cache_info().items():
+        print(f"{name} cache: {info['hits']} hits, {info['misses']} misses, hit rate {info['hit_rate']:.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=300, help="Data keys in the pool.")
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--key-size", type=int, choices=aes.AES_KEY_SIZES, default=aes.DEFAULT_KEY_SIZE)
+    parser.add_argument("--message-size", type=int, default=64, help="Plaintext bytes per operation.")
+    args = parser.parse_args()
+    run(args.keys, args.operations, args.key_size, args.message_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measure Caesar and Vigenere throughput from 1 KB to 100 MB inputs.
+
+Run from the repository root:
+
+    python -m benchmarks.classical_ciphers --sizes 1K 1M 100M
+
+Sizes up to --legacy-max are also run through a per-character reference loop built from
+`shift_character`/`encrypt_character`, the way the ciphers used to be implemented.
+"""
+import argparse
+import random
+import string
+import time
+
+from algorithms_type.caesar_cipher import encrypt_message, shift_character
+from algorithms_type.vigenere_cipher import encrypt_character, vigenere_encryption
+from benchmarks.common import parse_size
+
+
+def sample_text(size: int) -> str:
+    """Mixed-case English-like text with spaces and punctuation."""
+    words = ["".join(random.choices(string.ascii_letters, k=random.randint(1, 9))) for _ in range(512)]
+    text = " ".join(random.choices(words, k=size // 5 + 1)) + ".,!"
+    return (text * (size // len(text) + 1))[:size]
+
+
+def legacy_caesar(message: str, shift: int, include_special_chars: bool) -> str:
+    result = []
+    for char in message:
+        if char.isalpha():
+            result.append(shift_character(char, shift))
+        elif include_special_chars:
+            result.append(char)
+    return "".join(result)
+
+
+def legacy_vigenere(message: str, key: str, include_special_chars: bool) -> str:
+    result = []
+    for i, char in enumerate(message):
+        if char.isalpha():
+            result.append(encrypt_character(char, key[i % len(key)]))
+        elif include_special_chars:
+            result.append(char)
+    return "".join(result)
+
+
+def throughput(func, size: int) -> float:
+    start = time.perf_counter()
+    func()
+    return size / (time.perf_counter() - start) / (1 << 20)
+
+
+def run(sizes: list, legacy_max: int) -> None:
+    print(f"{'size':>10} {'cipher':>9} {'table MB/s':>11} {'legacy MB/s':>12}")
+    for size in sizes:
+        message = sample_text(size)
+        cases = {
+            "caesar": (lambda: encrypt_message(message, 3, True), lambda: legacy_caesar(message, 3, True)),
+            "vigenere": (lambda: vigenere_encryption(message, "Lemon", True),
+                         lambda: legacy_vigenere(message, "Lemon", True)),
+        }
+        for name, (table, legacy) in cases.items():
+            legacy_rate = f"{throughput(legacy, size):>12.2f}" if size <= legacy_max else f"{'-':>12}"
+            print(f"{size:>10} {name:>9} {throughput(table, size):>11.2f} {legacy_rate}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["1K", "10K", "100K", "1M", "10M", "100M"])
+    parser.add_argument("--legacy-max", default="1M", help="Largest size also run through the reference loop.")
+    args = parser.parse_args()
+    run([parse_size(size) for size in args.sizes], parse_size(args.legacy_max))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measure Caesar/Vigenere key recovery throughput on synthetic English-frequency ciphertext.
+
+Run from the repository root (requires numpy):
+
+    python -m benchmarks.classical_solver --sizes 1M 4M --key lemon
+"""
+import argparse
+import time
+
+import numpy as np
+
+from algorithms_type.caesar_cipher import encrypt_message
+from algorithms_type.classical_solver import ENGLISH_FREQUENCIES, crack_caesar, crack_vigenere
+from algorithms_type.vigenere_cipher import vigenere_encryption
+from benchmarks.common import parse_size
+
+
+def sample_plaintext(size: int, seed=0) -> str:
+    """Lowercase letters drawn with English frequencies, split into words by spaces."""
+    rng = np.random.default_rng(seed)
+    letters = rng.choice(26, size=size, p=ENGLISH_FREQUENCIES).astype(np.uint8) + ord("a")
+    letters[rng.random(size) < 0.18] = ord(" ")
+    return letters.tobytes().decode("ascii")
+
+
+def run(sizes: list, shift: int, key: str) -> None:
+    print(f"{'size':>10} {'cipher':>9} {'seconds':>8} {'MB/s':>8} {'recovered':>12}")
+    for size in sizes:
+        plaintext = sample_plaintext(size)
+        cases = {
+            "caesar": (encrypt_message(plaintext, shift, True), crack_caesar, shift),
+            "vigenere": (vigenere_encryption(plaintext, key, True), crack_vigenere, key),
+        }
+        for name, (ciphertext, crack, expected) in cases.items():
+            start = time.perf_counter()
+            recovered = crack(ciphertext)
+            elapsed = time.perf_counter() - start
+            status = "ok" if recovered == expected else f"{recovered!s:.12}"
+            print(f"{size:>10} {name:>9} {elapsed:>8.3f} {size / elapsed / (1 << 20):>8.1f} {status:>12}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["100K", "1M", "4M", "16M"])
+    parser.add_argument("--shift", type=int, default=11)
+    parser.add_argument("--key", default="lemon")
+    args = parser.parse_args()
+    run([parse_size(size) for size in args.sizes], args.shift, args.key)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure cold-start time of the headless CLI and check that it never imports the GUI stack.
+
+Run from the repository root:
+
+    python -m benchmarks.cli_startup --runs 20
+
+Each run starts a fresh interpreter that encrypts a short message; the baseline is a bare
+interpreter start, so the difference is the CLI's own import and start-up cost.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import percentile
+
+BUDGET_SECONDS = 0.100
+GUI_MODULES = ("tkinter", "customtkinter")
+CASES = {
+    "bare interpreter": [sys.executable, "-c", "pass"],
+    "cli --list": [sys.executable, "-m", "cli", "--list"],
+    "cli caesar": [sys.executable, "-m", "cli", "caesar-cipher", "--key", "3"],
+    "cli vigenere": [sys.executable, "-m", "cli", "vigenere-cipher", "--key", "lemon"],
+    "cli rc4": [sys.executable, "-m", "cli", "rc4-stream-cipher", "--key", "lemon"],
+    "cli aes": [sys.executable, "-m", "cli", "aes", "--key-output", "/dev/null"],
+}
+GUI_CHECK = (
+    "import sys, runpy; sys.argv = ['cli', 'aes', '--key-output', '/dev/null'];"
+    "\ntry: runpy.run_module('cli', run_name='__main__')\nexcept SystemExit: pass"
+    f"\nsys.exit(any(name in sys.modules for name in {GUI_MODULES!r}))"
+)
+
+
+def time_command(command: list, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, input=b"hello world", stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'command':>18} {'median ms':>10} {'p90 ms':>8}")
+    over_budget = []
+    for name, command in CASES.items():
+        timings = time_command(command, args.runs)
+        median = statistics.median(timings)
+        print(f"{name:>18} {median * 1000:>10.1f} {percentile(timings, 0.9) * 1000:>8.1f}")
+        if median > BUDGET_SECONDS:
+            over_budget.append(name)
+
+    gui_imported = subprocess.run([sys.executable, "-c", GUI_CHECK], input=b"x", stdout=subprocess.DEVNULL).returncode
+    print(f"GUI modules imported: {'yes' if gui_imported else 'no'}")
+    if over_budget:
+        print(f"Over the {BUDGET_SECONDS * 1000:.0f} ms budget: {', '.join(over_budget)}")
+    if gui_imported or over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""Helpers shared by the benchmark scripts."""
+
+UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """Parse sizes such as '64', '1K' or '100M'."""
+    if text[-1].upper() in UNITS:
+        return int(text[:-1]) * UNITS[text[-1].upper()]
+    return int(text)
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
@@ -0,0 +1,66 @@
+"""
+Compare the size of the string ciphertext formats with the binary envelope.
+
+Run from the repository root:
+
+    python -m benchmarks.envelope_size --sizes 16 1K 64K
+
+The string format is what `run_algorithm` returns, UTF-8 encoded, plus the non-secret
+data needed to decrypt it (the AES IV in hex, the RSA byte lengths as JSON). The envelope
+is `envelope.seal` of the same message, raw and as Base64 text. Caesar and Vigenere
+ciphertext is already one byte per input byte, so they only pay the envelope header.
+"""
+import argparse
+import json
+import os
+import time
+
+import envelope
+from algorithms import AlgorithmSelector
+from benchmarks.common import parse_size
+
+KEYS = {"Caesar Cipher": 3, "Vigenere Cipher": "lemon", "RC4 Stream Cipher": "lemon"}
+
+
+def string_format_size(selector: AlgorithmSelector, algorithm_name: str, message: str) -> int:
+    encrypted_message = selector.run_algorithm(algorithm_name, message, KEYS.get(algorithm_name), True)
+    size = len(encrypted_message.encode())
+    metadata = selector.generated_metadata.get(algorithm_name) or {}
+    if "iv" in metadata:
+        size += len(metadata["iv"])
+    if metadata.get("byte_lengths") is not None:
+        size += len(json.dumps(metadata["byte_lengths"]))
+    return size
+
+
+def run(sizes: list, repeat: int) -> None:
+    selector = AlgorithmSelector()
+    print(f"{'algorithm':>18} {'size':>8} {'string':>10} {'envelope':>10} {'ratio':>7} {'base64':>10} {'ratio':>7} "
+          f"{'parse µs':>9}")
+    for algorithm_name in envelope.ENVELOPE_ALGORITHMS:
+        for size in sizes:
+            message = os.urandom(size).hex()[:size]
+            string_size = string_format_size(selector, algorithm_name, message)
+            sealed = envelope.seal(selector, algorithm_name, message.encode(), KEYS.get(algorithm_name), True)
+            text_size = len(envelope.to_text(sealed))
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                envelope.parse_envelope(sealed)
+            parse_us = (time.perf_counter() - start) / repeat * 1e6
+
+            print(f"{algorithm_name:>18} {size:>8} {string_size:>10} {len(sealed):>10} "
+                  f"{string_size / len(sealed):>6.2f}x {text_size:>10} {string_size / text_size:>6.2f}x "
+                  f"{parse_us:>9.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["16", "1K", "64K"], help="Message sizes in characters.")
+    parser.add_argument("--repeat", type=int, default=1000, help="Parses timed per case.")
+    args = parser.parse_args()
+    run([parse_size(size) for size in args.sizes], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measure the cost of `import algorithms` and check that no cipher module is loaded by it.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time --runs 10
+
+Each run imports `algorithms` in a fresh interpreter under `-X importtime` and reads the
+cumulative time of the import; the script exits non-zero when the median exceeds the budget.
+Byte-code writing is enabled so that, after a warm-up run, compilation is not measured.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BUDGET_MS = 10.0  # Generous for slow CI hosts; about 2 ms on a typical desktop
+CHECK = (
+    "import sys, algorithms;"
+    "support = {'algorithms_type.streaming', 'algorithms_type.instrumentation'};"
+    "loaded = [m for m in sys.modules if m.startswith('algorithms_type.') and m not in support];"
+    "print(','.join(loaded))"
+)
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of `module` in a fresh interpreter, in milliseconds."""
+    env = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, check=True, env=env)
+    for line in completed.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1000
+    raise ValueError(f"No import time reported for {module}.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    args = parser.parse_args()
+
+    import_time_ms("algorithms")  # Warm-up: writes the byte-code cache
+    timings = [import_time_ms("algorithms") for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"import algorithms: median {median:.2f} ms, max {max(timings):.2f} ms over {args.runs} runs")
+
+    loaded = subprocess.run([sys.executable, "-c", CHECK], capture_output=True, text=True, check=True).stdout.strip()
+    print(f"cipher modules loaded on import: {loaded or 'none'}")
+    if median > args.budget_ms or loaded:
+        print(f"FAILED (budget {args.budget_ms:.1f} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
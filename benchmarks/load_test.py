@@ -0,0 +1,86 @@
+"""
+Load-test the async_service JSON-line server and report requests/s and p50/p99 latency.
+
+Run from the repository root against a running server:
+
+    python -m async_service --port 8765 &
+    python -m benchmarks.load_test --port 8765 --connections 32 --requests 200
+
+or let the script start a server in-process with --spawn.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from async_service import serve
+from benchmarks.common import percentile
+
+
+async def client(host: str, port: int, requests: int, request: dict, latencies: list, errors: list):
+    """Send `requests` requests one after another over one connection, recording latencies."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(requests):
+            start = time.perf_counter()
+            writer.write(json.dumps(dict(request, id=i)).encode() + b"\n")
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            if "error" in response:
+                errors.append(response["error"])
+    finally:
+        writer.close()
+
+
+async def run(args) -> None:
+    server_task = None
+    if args.spawn:
+        server_task = asyncio.create_task(serve(args.host, args.port))
+        await asyncio.sleep(0.2)
+
+    request = {
+        "algorithm": args.algorithm,
+        "message": "x" * args.message_size,
+        "key": args.key,
+        "include_special_chars": True,
+    }
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(args.host, args.port, args.requests, request, latencies, errors)
+        for _ in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    print(f"algorithm:    {args.algorithm}")
+    print(f"requests:     {len(latencies)} ({len(errors)} errors) over {args.connections} connections")
+    print(f"requests/s:   {len(latencies) / elapsed:.0f}")
+    print(f"latency p50:  {statistics.median(latencies) * 1000:.2f} ms")
+    print(f"latency p99:  {percentile(latencies, 0.99) * 1000:.2f} ms")
+    if errors:
+        print(f"first error:  {errors[0]}")
+
+    if server_task is not None:
+        server_task.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--spawn", action="store_true", help="Start a server in this process first.")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per connection.")
+    parser.add_argument("--algorithm", default="Vigenere Cipher")
+    parser.add_argument("--key", default="lemon")
+    parser.add_argument("--message-size", type=int, default=256)
+    args = parser.parse_args()
+    if args.algorithm == "Caesar Cipher":
+        args.key = int(args.key) if args.key.lstrip("-").isdigit() else 3
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare RSA key generation latency of the built-in prime generator and sympy.
+
+Run from the repository root (the sympy column needs sympy installed):
+
+    python -m benchmarks.rsa_keygen --sizes 1024 2048 --runs 20
+"""
+import argparse
+import statistics
+import time
+
+from algorithms_type.rsa import generate_large_prime, generate_large_prime_sympy, generate_rsa_key
+from benchmarks.common import percentile
+
+PRIME_GENERATORS = {
+    "builtin": generate_large_prime,
+    "sympy": generate_large_prime_sympy,
+}
+
+
+def measure(bits: int, prime_generator, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        generate_rsa_key(bits, prime_generator=prime_generator)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run(sizes: list, generators: list, runs: int) -> None:
+    print(f"{'bits':>6} {'generator':>10} {'mean ms':>10} {'p99 ms':>10}")
+    for bits in sizes:
+        for name in generators:
+            samples = measure(bits, PRIME_GENERATORS[name], runs)
+            print(f"{bits:>6} {name:>10} {statistics.mean(samples) * 1000:>10.1f} "
+                  f"{percentile(samples, 0.99) * 1000:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 2048, 3072, 4096], help="Key sizes in bits.")
+    parser.add_argument("--generators", nargs="+", choices=list(PRIME_GENERATORS), default=list(PRIME_GENERATORS))
+    parser.add_argument("--runs", type=int, default=20, help="Keys generated per size and generator.")
+    args = parser.parse_args()
+    run(args.sizes, args.generators, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Benchmark every registered algorithm from 16 B to 64 MB and track throughput regressions.
+
+Run from the repository root:
+
+    python -m benchmarks.suite run --output results.json
+    python -m benchmarks.suite run --sizes 16 4K 1M --algorithms AES "RC4 Stream Cipher"
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.1
+
+Each algorithm is measured in two phases. "setup" is the per-key work done before any
+data is encrypted (Caesar/Vigenere translation tables, the RC4 KSA, the AES key schedule,
+RSA key generation); "steady" encrypts one message of each size with that setup already
+done. RSA is measured with its packed-block engine, the only one usable on large inputs;
+each hybrid RSA+AES message includes wrapping its own fresh session key.
+Every sample repeats the operation until it has run for at least --min-sample-time, so
+even 16-byte messages are timed accurately; sizes whose predicted time exceeds
+--max-case-seconds are skipped and recorded as such.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from algorithms import AlgorithmSelector
+from benchmarks.common import parse_size
+
+DEFAULT_SIZES = ["16", "256", "4K", "64K", "1M", "16M", "64M"]
+RESULTS_VERSION = 1
+TEXT_ALPHABET = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ ,."
+
+
+def sample_data(size: int, kind: str):
+    """Random bytes, or random ASCII letters with spaces and punctuation for the text ciphers."""
+    data = os.urandom(size)
+    if kind == "bytes":
+        return data
+    table = bytes(TEXT_ALPHABET[i % len(TEXT_ALPHABET)] for i in range(256))
+    return data.translate(table).decode("ascii")
+
+
+def caesar_case():
+    from algorithms_type.caesar_cipher import caesar_table, encrypt_message
+
+    def setup():
+        caesar_table.cache_clear()
+        caesar_table(3, True)
+
+    return "text", setup, lambda data: data, lambda data: encrypt_message(data, 3, True)
+
+
+def vigenere_case():
+    from algorithms_type.vigenere_cipher import vigenere_byte_table, vigenere_encryption, vigenere_table
+
+    def setup():
+        vigenere_table.cache_clear()
+        vigenere_byte_table.cache_clear()
+        for key_char in "lemon":
+            vigenere_table(key_char)
+            vigenere_byte_table(key_char)
+
+    return "text", setup, lambda data: data, lambda data: vigenere_encryption(data, "lemon", True)
+
+
+def rc4_case():
+    from algorithms_type.rc4_stream_cipher import RC4
+
+    cipher = RC4("lemon")
+    return "bytes", lambda: RC4("lemon"), lambda data: data, cipher.update
+
+
+def aes_case():
+    from algorithms_type.aes import cbc_encrypt_chunk, key_schedule, message_padding
+
+    key, iv = os.urandom(32), os.urandom(16)  # AES-256, the default key size
+    round_keys = key_schedule(key)
+    return "bytes", lambda: key_schedule(key), message_padding, lambda data: cbc_encrypt_chunk(data, round_keys, iv)
+
+
+def rsa_case():
+    from algorithms_type.rsa import encrypt_bytes_packed, generate_rsa_key
+
+    public_key = generate_rsa_key().public_key
+    return "bytes", generate_rsa_key, lambda data: data, lambda data: encrypt_bytes_packed(data, public_key)
+
+
+def hybrid_case():
+    from algorithms_type.hybrid import hybrid_encrypt_into
+    from algorithms_type.rsa import generate_rsa_key
+
+    public_key = generate_rsa_key().public_key
+    return "bytes", generate_rsa_key, lambda data: data, lambda data: hybrid_encrypt_into(data, public_key)
+
+
+BENCHMARK_CASES = {
+    "Caesar Cipher": caesar_case,
+    "Vigenere Cipher": vigenere_case,
+    "RC4 Stream Cipher": rc4_case,
+    "AES": aes_case,
+    "RSA": rsa_case,
+    "Hybrid RSA+AES": hybrid_case,
+}
+
+
+def generic_case(spec):
+    """Algorithms without a dedicated case (e.g. third-party ones) are timed end to end, setup included."""
+    key = {"int": 3, "str": "lemon"}.get(spec.key_type)
+    return "text", None, lambda data: data, lambda data: spec.encrypt(data, key, True, {})
+
+
+def time_samples(func, repeat: int, min_sample_time: float, time_budget: float) -> list:
+    """
+    Seconds per call of func for up to `repeat` samples.
+
+    Each sample runs func enough times to last at least `min_sample_time`. Sampling stops
+    early once `time_budget` is spent, but always collects two samples unless the first
+    one alone exceeds the budget.
+    """
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    number = max(1, int(min_sample_time / first)) if first > 0 else 1000
+    samples = [first] if number == 1 else []
+    deadline = time.perf_counter() + time_budget
+
+    while len(samples) < repeat:
+        if samples and time.perf_counter() > deadline and (len(samples) >= 2 or first > time_budget):
+            break
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def summarize(algorithm_name: str, phase: str, size: int, samples: list) -> dict:
+    ops = [1 / seconds for seconds in samples]
+    result = {
+        "algorithm": algorithm_name,
+        "phase": phase,
+        "size": size,
+        "samples": len(samples),
+        "seconds_mean": statistics.mean(samples),
+        "seconds_stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "ops_per_s": statistics.mean(ops),
+        "ops_per_s_stdev": statistics.stdev(ops) if len(ops) > 1 else 0.0,
+    }
+    if phase == "steady":
+        mb_per_s = [size * rate / (1 << 20) for rate in ops]
+        result["mb_per_s"] = statistics.mean(mb_per_s)
+        result["mb_per_s_stdev"] = statistics.stdev(mb_per_s) if len(mb_per_s) > 1 else 0.0
+    return result
+
+
+def format_result(result: dict) -> str:
+    if result.get("skipped"):
+        return f"{result['algorithm']:>18} {result['phase']:>7} {result['size']:>10}  skipped ({result['skipped']})"
+    line = (f"{result['algorithm']:>18} {result['phase']:>7} {result['size']:>10} "
+            f"{result['ops_per_s']:>12.1f} ±{result['ops_per_s_stdev'] / result['ops_per_s']:>5.1%}")
+    if "mb_per_s" in result:
+        line += f" {result['mb_per_s']:>10.2f} ±{result['mb_per_s_stdev'] / result['mb_per_s']:>5.1%}"
+    return line
+
+
+def run_algorithm(algorithm_name: str, spec, sizes: list, args) -> list:
+    case = BENCHMARK_CASES.get(algorithm_name)
+    kind, setup, prepare, encrypt = case() if case is not None else generic_case(spec)
+    results = []
+
+    if setup is not None:
+        samples = time_samples(setup, args.repeat, args.min_sample_time, args.time_budget)
+        results.append(summarize(algorithm_name, "setup", 0, samples))
+        print(format_result(results[-1]), flush=True)
+
+    mb_per_s = None
+    for size in sizes:
+        predicted = size / (mb_per_s * (1 << 20)) if mb_per_s else 0.0
+        if predicted > args.max_case_seconds:
+            results.append({"algorithm": algorithm_name, "phase": "steady", "size": size,
+                            "skipped": f"~{predicted:.0f} s per call"})
+        else:
+            data = prepare(sample_data(size, kind))
+            samples = time_samples(lambda: encrypt(data), args.repeat, args.min_sample_time, args.time_budget)
+            results.append(summarize(algorithm_name, "steady", size, samples))
+            mb_per_s = results[-1]["mb_per_s"]
+        print(format_result(results[-1]), flush=True)
+    return results
+
+
+def run(args) -> dict:
+    algorithms = AlgorithmSelector().algorithms
+    names = args.algorithms or list(algorithms)
+    for name in names:
+        if name not in algorithms:
+            raise SystemExit(f"Unknown algorithm '{name}'; registered: {', '.join(algorithms)}")
+    sizes = [parse_size(size) for size in args.sizes]
+
+    print(f"{'algorithm':>18} {'phase':>7} {'size':>10} {'ops/s':>12} {'±':>6} {'MB/s':>10} {'±':>6}")
+    results = []
+    for name in names:
+        results += run_algorithm(name, algorithms[name], sizes, args)
+
+    report = {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            return compare(json.load(baseline_file), report, args.threshold)
+    return report
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Print the change of every result present in both reports and return the regressions.
+
+    Steady-state results are compared by MB/s and setup results by ops/s; a result
+    regresses when it is more than `threshold` (a fraction) slower than the baseline.
+    """
+    def metric(result):
+        return result.get("mb_per_s", result["ops_per_s"])
+
+    baseline_results = {
+        (result["algorithm"], result["phase"], result["size"]): result
+        for result in baseline["results"] if not result.get("skipped")
+    }
+    regressions = []
+    print(f"{'algorithm':>18} {'phase':>7} {'size':>10} {'baseline':>12} {'current':>12} {'change':>8}")
+    for result in current["results"]:
+        key = (result["algorithm"], result["phase"], result["size"])
+        if result.get("skipped") or key not in baseline_results:
+            continue
+        before, after = metric(baseline_results[key]), metric(result)
+        change = after / before - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(dict(result, baseline=before, change=change))
+            flag = "  REGRESSION"
+        print(f"{key[0]:>18} {key[1]:>7} {key[2]:>10} {before:>12.2f} {after:>12.2f} {change:>+8.1%}{flag}")
+
+    print(f"{len(regressions)} regression(s) beyond {threshold:.0%}.")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument("--algorithms", nargs="+", help="Algorithm names (default: every registered one).")
+    run_parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument("--repeat", type=int, default=5, help="Samples per case.")
+    run_parser.add_argument("--min-sample-time", type=float, default=0.05, help="Seconds each sample runs for.")
+    run_parser.add_argument("--time-budget", type=float, default=10.0, help="Seconds after which sampling stops early.")
+    run_parser.add_argument("--max-case-seconds", type=float, default=60.0,
+                            help="Skip sizes predicted to take longer than this per call.")
+    run_parser.add_argument("--output", help="Write the results as JSON to this file.")
+    run_parser.add_argument("--baseline", help="Compare against this JSON results file afterwards.")
+    run_parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown as a fraction.")
+
+    compare_parser = commands.add_parser("compare", help="Compare two JSON results files.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown as a fraction.")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        outcome = run(args)
+    else:
+        with open(args.baseline) as baseline_file, open(args.current) as current_file:
+            outcome = compare(json.load(baseline_file), json.load(current_file), args.threshold)
+    if isinstance(outcome, list) and outcome:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Headless command-line front end: encrypt stdin or a file to stdout or a file.
+
+Run from the repository root:
+
+    python -m cli "Caesar Cipher" --key 3 -i message.txt
+    python -m cli vigenere-cipher --key lemon --include-special-chars < message.txt
+    python -m cli aes -i data.bin -o data.enc --key-output aes_key.json
+    python -m cli --list
+
+Input is read and encrypted in fixed-size chunks with constant memory, except that RSA,
+AES and hybrid RSA+AES need whole blocks, so up to one block is held back between
+chunks. Generated key material is written as JSON to stderr, or to --key-output; with
+`-f envelope` the output is a framed binary envelope (see `envelope.py`) carrying the IV
+and key ID itself. Only the selected algorithm's module is imported, and never the GUI
+stack, to keep start-up fast on headless machines.
+"""
+import argparse
+import binascii
+import sys
+from contextlib import ExitStack
+
+from registry import ALGORITHM_METADATA, get_algorithm
+
+CLI_CHUNK_SIZE = 1 << 16  # Bytes (or characters, for the text ciphers) read per step
+OUTPUT_FORMATS = ("raw", "hex", "base64", "envelope")
+
+
+def slugify(name: str) -> str:
+    return name.lower().replace(" ", "-")
+
+
+def resolve_algorithm(name: str) -> str:
+    """Match an algorithm name exactly, case-insensitively or as a slug such as 'rc4-stream-cipher'."""
+    for algorithm_name in ALGORITHM_METADATA:
+        if name.lower() in (algorithm_name.lower(), slugify(algorithm_name)):
+            return algorithm_name
+    choices = ", ".join(slugify(algorithm_name) for algorithm_name in ALGORITHM_METADATA)
+    raise ValueError(f"Algorithm '{name}' is not available; choose one of: {choices}.")
+
+
+def encode_output(chunks, output_format: str):
+    """Yield raw, hex or Base64 output for a stream of encrypted byte chunks."""
+    if output_format == "raw":
+        yield from chunks
+        return
+    if output_format == "hex":
+        for chunk in chunks:
+            yield binascii.hexlify(chunk)
+        yield b"\n"
+        return
+
+    # Base64 is encoded in multiples of 3 bytes so the pieces join into one valid string
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk
+        cut = len(data) - len(data) % 3
+        carry = data[cut:]
+        if cut:
+            yield binascii.b2a_base64(data[:cut], newline=False)
+    yield binascii.b2a_base64(carry)
+
+
+def envelope_output(algorithm_name: str, chunks, key_material: dict):
+    """Frame encrypted chunks as an envelope; the first chunk is pulled early so the key material is known."""
+    from itertools import chain
+
+    from envelope import envelope_fields, frame_chunks
+
+    first = next(chunks, b"")
+    iv, key_id = envelope_fields(algorithm_name, key_material)
+    return frame_chunks(algorithm_name, chain((first,), chunks), iv, key_id)
+
+
+def write_key_material(key_material: dict, path) -> None:
+    """Write key material as JSON to stderr, or to a file only its owner can read (see `keystore.open_private`)."""
+    import json
+
+    text = json.dumps(key_material, indent=2) + "\n"
+    if path is None:
+        sys.stderr.write(text)
+    else:
+        from keystore import open_private
+
+        with open_private(path) as key_file:
+            key_file.write(text.encode())
+
+
+def run(args) -> int:
+    """Encrypt args.input to args.output; returns the number of bytes written."""
+    algorithm_name = resolve_algorithm(args.algorithm)
+    spec = get_algorithm(algorithm_name)
+    if spec.key_type in ("int", "str") and not args.key:
+        raise ValueError(f"{algorithm_name} requires --key.")
+    key = int(args.key) if spec.key_type == "int" else args.key
+
+    key_material = {}
+    written = 0
+    with ExitStack() as stack:
+        source = sys.stdin.buffer if args.input in (None, "-") else stack.enter_context(open(args.input, "rb"))
+        chunks = spec.byte_stream(source, key, args.include_special_chars, key_material, args.chunk_size, args.iv)
+        sink = sys.stdout.buffer if args.output in (None, "-") else stack.enter_context(open(args.output, "wb"))
+        if args.output_format == "envelope":
+            pieces = envelope_output(algorithm_name, chunks, key_material)
+        else:
+            pieces = encode_output(chunks, args.output_format)
+        for piece in pieces:
+            sink.write(piece)
+            written += len(piece)
+        sink.flush()
+
+    if key_material:
+        write_key_material(key_material, args.key_output)
+    return written
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("algorithm", nargs="?", help="Algorithm name or slug, e.g. 'AES' or 'caesar-cipher'.")
+    parser.add_argument("--list", action="store_true", help="List the available algorithms and exit.")
+    parser.add_argument("-k", "--key",
+                        help="Shift or key; for AES, an optional 32, 48 or 64-digit hex key (AES-128/192/256).")
+    parser.add_argument("--iv", help="AES only: 32-digit hex IV (generated if omitted).")
+    parser.add_argument("-s", "--include-special-chars", action="store_true",
+                        help="Caesar/Vigenere: keep non-letter characters.")
+    parser.add_argument("-i", "--input", help="Input file (default: stdin).")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout).")
+    parser.add_argument("-f", "--output-format", choices=OUTPUT_FORMATS, default="raw")
+    parser.add_argument("--key-output", help="Write generated key material here instead of stderr.")
+    parser.add_argument("--chunk-size", type=int, default=CLI_CHUNK_SIZE)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.list:
+        for algorithm_name, metadata in ALGORITHM_METADATA.items():
+            print(f"{slugify(algorithm_name):<20} key: {metadata['key_type']}")
+        return 0
+    if args.algorithm is None:
+        parser.error("the algorithm argument is required")
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+
+    try:
+        run(args)
+    except (ValueError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
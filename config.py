@@ -1,31 +1,2 @@
-ALGORITHM_METADATA = {
-    "Caesar Cipher": {
-            "key_type": "int",
-            "key_label": "Number of Shifts",
-            "generated_key": False,
-    },
-    "Vigenere Cipher": {
-        "key_type": "str",
-        "key_label": "Key",
-        "generated_key": False,
-    },
-    "RC4 Stream Cipher": {
-        "key_type": "str",
-        "key_label": "Key",
-        "generated_key": False,
-    },
-    "RSA": {
-        "key_type": "none",
-        "key_label": "",
-        "generated_key": True,
-    },
-    "AES": {
-        "key_type": "none",
-        "key_label": "",
-        "generated_key": True,
-    },
-}
-
-
-
-
+# Algorithm metadata is derived from the registry; see registry.py to add algorithms.
+from registry import ALGORITHM_METADATA
@@ -0,0 +1,209 @@
+"""
+Versioned binary envelope for ciphertext: a fixed header followed by the raw ciphertext.
+
+Layout (big-endian):
+
+    ENVELOPE_HEADER  magic "CE", version, algorithm ID, mode, flags, IV length,
+                     key ID length, payload length (u64)
+    IV               IV length bytes (e.g. the AES-CBC IV), may be empty
+    key ID           key ID length bytes (e.g. the RSA public-key fingerprint), may be empty
+    payload          payload length bytes of ciphertext, or, with FLAG_FRAMED, a sequence of
+                     frames (u32 length + bytes) ending with a zero-length frame
+
+Framed envelopes can be written while the ciphertext is still being produced; their
+payload length is the total when known and UNKNOWN_LENGTH otherwise. `parse_envelope`
+returns memoryviews into the input, so parsing copies no ciphertext. Hex and Base64 are
+only presentation encodings of the whole envelope (`to_text` / `from_text`).
+"""
+import base64
+import struct
+from typing import NamedTuple
+
+ENVELOPE_MAGIC = b"CE"
+ENVELOPE_VERSION = 1
+ENVELOPE_HEADER = struct.Struct(">2sBBBBBBQ")
+FRAME_HEADER = struct.Struct(">I")
+END_FRAME = FRAME_HEADER.pack(0)
+FLAG_FRAMED = 0x01
+UNKNOWN_LENGTH = (1 << 64) - 1
+
+MODE_NONE = 0  # Classical and stream ciphers
+MODE_CBC = 1
+MODE_CTR = 2
+MODE_PACKED = 3  # RSA packed blocks (see rsa.encrypt_bytes_packed)
+
+# Algorithm name -> (algorithm ID, default mode); IDs are part of the format and never reused
+ENVELOPE_ALGORITHMS = {
+    "Caesar Cipher": (1, MODE_NONE),
+    "Vigenere Cipher": (2, MODE_NONE),
+    "RC4 Stream Cipher": (3, MODE_NONE),
+    "RSA": (4, MODE_PACKED),
+    "AES": (5, MODE_CBC),
+    "Hybrid RSA+AES": (6, MODE_CBC),  # The payload carries the wrapped session key and IV (see hybrid.py)
+}
+
+
+class Envelope(NamedTuple):
+    """A parsed envelope; iv, key_id and chunks are memoryviews into the parsed buffer."""
+    algorithm: str
+    mode: int
+    iv: memoryview
+    key_id: memoryview
+    chunks: tuple  # The payload, or the payload frames of a framed envelope
+    framed: bool
+    end: int  # Offset just past the envelope
+
+    @property
+    def payload_length(self) -> int:
+        return sum(len(chunk) for chunk in self.chunks)
+
+    def payload(self):
+        """The ciphertext: a view when unframed, otherwise the frames joined into bytes."""
+        if len(self.chunks) == 1:
+            return self.chunks[0]
+        return b"".join(self.chunks)
+
+
+def register_envelope_algorithm(algorithm_name: str, algorithm_id: int, mode=MODE_NONE) -> None:
+    """Assign an envelope algorithm ID to a (third-party) algorithm."""
+    for name, (existing_id, _) in ENVELOPE_ALGORITHMS.items():
+        if existing_id == algorithm_id and name != algorithm_name:
+            raise ValueError(f"Envelope algorithm ID {algorithm_id} is already used by '{name}'.")
+    ENVELOPE_ALGORITHMS[algorithm_name] = (algorithm_id, mode)
+
+
+def algorithm_name_for_id(algorithm_id: int) -> str:
+    for name, (existing_id, _) in ENVELOPE_ALGORITHMS.items():
+        if existing_id == algorithm_id:
+            return name
+    raise ValueError(f"Unknown envelope algorithm ID {algorithm_id}.")
+
+
+def envelope_header(algorithm_name: str, payload_length: int, iv=b"", key_id=b"", mode=None, framed=False) -> bytes:
+    """Header, IV and key ID of an envelope; the payload (or its frames) follows."""
+    if algorithm_name not in ENVELOPE_ALGORITHMS:
+        raise ValueError(f"Algorithm '{algorithm_name}' has no envelope algorithm ID.")
+    if len(iv) > 255 or len(key_id) > 255:
+        raise ValueError("IV and key ID must be at most 255 bytes.")
+    algorithm_id, default_mode = ENVELOPE_ALGORITHMS[algorithm_name]
+    header = ENVELOPE_HEADER.pack(
+        ENVELOPE_MAGIC, ENVELOPE_VERSION, algorithm_id, default_mode if mode is None else mode,
+        FLAG_FRAMED if framed else 0, len(iv), len(key_id), payload_length
+    )
+    return header + bytes(iv) + bytes(key_id)
+
+
+def pack_envelope(algorithm_name: str, payload, iv=b"", key_id=b"", mode=None) -> bytes:
+    """A complete unframed envelope around a bytes-like payload."""
+    return envelope_header(algorithm_name, len(payload), iv, key_id, mode) + payload
+
+
+def frame_chunks(algorithm_name: str, chunks, iv=b"", key_id=b"", mode=None):
+    """
+    Yield the pieces of a framed envelope (header, then each frame) for an iterable of ciphertext chunks.
+
+    The pieces are written out as they come, so a stream never has to be held in memory.
+    """
+    yield envelope_header(algorithm_name, UNKNOWN_LENGTH, iv, key_id, mode, framed=True)
+    for chunk in chunks:
+        if chunk:
+            yield FRAME_HEADER.pack(len(chunk))
+            yield chunk
+    yield END_FRAME
+
+
+def parse_envelope(data, offset=0) -> Envelope:
+    """Parse the envelope at `offset` of a bytes-like object without copying its contents."""
+    view = memoryview(data).cast("B")
+    if len(view) - offset < ENVELOPE_HEADER.size:
+        raise ValueError("Truncated envelope header.")
+    magic, version, algorithm_id, mode, flags, iv_length, key_id_length, payload_length = \
+        ENVELOPE_HEADER.unpack_from(view, offset)
+    if magic != ENVELOPE_MAGIC:
+        raise ValueError("Not an envelope (bad magic).")
+    if version != ENVELOPE_VERSION:
+        raise ValueError(f"Unsupported envelope version {version}.")
+
+    position = offset + ENVELOPE_HEADER.size
+    iv = view[position:position + iv_length]
+    position += iv_length
+    key_id = view[position:position + key_id_length]
+    position += key_id_length
+    if len(iv) != iv_length or len(key_id) != key_id_length:
+        raise ValueError("Truncated envelope header.")
+
+    framed = bool(flags & FLAG_FRAMED)
+    if not framed:
+        if len(view) - position < payload_length:
+            raise ValueError("Truncated envelope payload.")
+        chunks = (view[position:position + payload_length],)
+        position += payload_length
+    else:
+        frames = []
+        while True:
+            if len(view) - position < FRAME_HEADER.size:
+                raise ValueError("Truncated envelope frame.")
+            (length,) = FRAME_HEADER.unpack_from(view, position)
+            position += FRAME_HEADER.size
+            if length == 0:
+                break
+            if len(view) - position < length:
+                raise ValueError("Truncated envelope frame.")
+            frames.append(view[position:position + length])
+            position += length
+        chunks = tuple(frames)
+        if payload_length != UNKNOWN_LENGTH and payload_length != sum(len(frame) for frame in frames):
+            raise ValueError("Envelope frames do not add up to the payload length.")
+
+    return Envelope(algorithm_name_for_id(algorithm_id), mode, iv, key_id, chunks, framed, position)
+
+
+def iter_envelopes(data):
+    """Parse consecutive envelopes from a bytes-like object."""
+    offset = 0
+    while offset < len(data):
+        envelope = parse_envelope(data, offset)
+        offset = envelope.end
+        yield envelope
+
+
+def to_text(envelope: bytes, encoding="base64") -> str:
+    """Present an envelope as Base64 or hex text."""
+    if encoding == "base64":
+        return base64.b64encode(envelope).decode("ascii")
+    if encoding == "hex":
+        return bytes(envelope).hex()
+    raise ValueError(f"Unknown text encoding '{encoding}'.")
+
+
+def from_text(text: str, encoding="base64") -> bytes:
+    if encoding == "base64":
+        return base64.b64decode(text)
+    if encoding == "hex":
+        return bytes.fromhex(text)
+    raise ValueError(f"Unknown text encoding '{encoding}'.")
+
+
+def envelope_fields(algorithm_name: str, metadata) -> tuple:
+    """IV and key ID for an envelope, from the generated metadata the selector (or CLI) recorded."""
+    if not metadata:
+        return b"", b""
+    iv = bytes.fromhex(metadata["iv"]) if "iv" in metadata else b""
+    key_id = b""
+    if metadata.get("key_id") is not None:
+        key_id = bytes.fromhex(metadata["key_id"])
+    elif "public_key" in metadata or "n" in metadata:
+        from keystore import public_key_id
+
+        public_key = metadata.get("public_key") or (metadata["e"], metadata["n"])
+        key_id = bytes.fromhex(public_key_id(public_key))
+    return iv, key_id
+
+
+def seal(selector, algorithm_name: str, data, key=None, include_special_chars=None) -> bytes:
+    """Encrypt a bytes-like message with an AlgorithmSelector and wrap the ciphertext in an envelope."""
+    ciphertext = selector.encrypt_into(algorithm_name, data, key=key, include_special_chars=include_special_chars)
+    metadata = selector.generated_metadata.get(algorithm_name) if selector.algorithms[algorithm_name].generated_key \
+        else None
+    iv, key_id = envelope_fields(algorithm_name, metadata)
+    return pack_envelope(algorithm_name, ciphertext, iv, key_id)
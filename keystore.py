@@ -0,0 +1,187 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from algorithms_type.rsa import RSAPrivateKey
+
+# File layout: FILE_HEADER, then records. Each record is a RECORD_HEADER followed by
+# `field_count` fields, each a u16 byte length and a big-endian unsigned integer.
+FILE_MAGIC = b"CAKS"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct(">4sB3x")
+RECORD_HEADER = struct.Struct(">BBHI16sQ")  # key type, field count, flags, fields length, key ID, created
+FIELD_LENGTH = struct.Struct(">H")
+
+KEY_TYPE_RSA_PRIVATE = 1
+FILE_MODE = 0o600  # The store holds private keys in plaintext: owner read/write only
+
+
+def public_key_id(public_key: tuple) -> str:
+    """Fingerprint an RSA public key (e, n): the first 16 bytes of SHA-256 over e and n, in hex."""
+    e, n = public_key
+    n_bytes = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return hashlib.sha256(e.to_bytes(4, "big") + n_bytes).digest()[:16].hex()
+
+
+def rsa_key_id(key: RSAPrivateKey) -> str:
+    """Fingerprint an RSA key by its public key (see `public_key_id`)."""
+    return public_key_id(key.public_key)
+
+
+def open_private(path, append=False):
+    """Open a key store file for writing, creating it (or tightening its mode) so only its owner can access it."""
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0) | (os.O_APPEND if append else os.O_TRUNC)
+    fd = os.open(path, flags, FILE_MODE)
+    if hasattr(os, "fchmod"):  # Also covers files created earlier, or under a permissive umask
+        os.fchmod(fd, FILE_MODE)
+    return os.fdopen(fd, "ab" if append else "wb")
+
+
+def encode_fields(values) -> bytes:
+    """Serialize integers as length-prefixed big-endian fields."""
+    parts = []
+    for value in values:
+        data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+        parts.append(FIELD_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def decode_fields(buffer, offset: int, count: int) -> list:
+    """Parse `count` length-prefixed integers from buffer starting at offset."""
+    values = []
+    for _ in range(count):
+        (length,) = FIELD_LENGTH.unpack_from(buffer, offset)
+        offset += FIELD_LENGTH.size
+        values.append(int.from_bytes(buffer[offset:offset + length], "big"))
+        offset += length
+    return values
+
+
+class KeyStore:
+    """
+    Append-only binary store of RSA keys, indexed by key ID (public-key fingerprint).
+
+    Opening a store only walks the fixed record headers to build the index; key fields
+    are read through a memory map and decoded when a key is requested, and the most
+    recently used decoded keys are kept in an LRU cache of `cache_size` entries.
+
+    Private keys are stored unencrypted, so the file is created with mode 0600 (owner
+    read/write only) and its mode is reset to 0600 whenever a key is added.
+    """
+
+    def __init__(self, path, cache_size=128):
+        self.path = path
+        self.cache_size = cache_size
+        self._index = {}  # key ID (hex) -> record offset
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._mmap = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open_private(path) as file:
+                file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+        self._load_index()
+
+    def _map(self):
+        """Return a read-only memory map of the file, remapping after appends."""
+        if self._mmap is None:
+            with open(self.path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _load_index(self):
+        buffer = self._map()
+        magic, version = FILE_HEADER.unpack_from(buffer, 0)
+        if magic != FILE_MAGIC:
+            raise ValueError(f"'{self.path}' is not a key store.")
+        if version != FILE_VERSION:
+            raise ValueError(f"Unsupported key store version {version}.")
+
+        offset = FILE_HEADER.size
+        while offset + RECORD_HEADER.size <= len(buffer):
+            _, _, _, fields_length, key_id, _ = RECORD_HEADER.unpack_from(buffer, offset)
+            if offset + RECORD_HEADER.size + fields_length > len(buffer):
+                break
+            self._index[key_id.hex()] = offset
+            offset += RECORD_HEADER.size + fields_length
+
+        if offset < len(buffer):
+            # Drop a truncated trailing record left by an interrupted write
+            self._mmap.close()
+            self._mmap = None
+            os.truncate(self.path, offset)
+
+    def put(self, key: RSAPrivateKey) -> str:
+        """Store an RSA key (if not already present) and return its key ID."""
+        key_id = rsa_key_id(key)
+        with self._lock:
+            if key_id in self._index:
+                return key_id
+
+            fields = encode_fields(key)
+            header = RECORD_HEADER.pack(
+                KEY_TYPE_RSA_PRIVATE, len(key), 0, len(fields), bytes.fromhex(key_id), int(time.time())
+            )
+            with open_private(self.path, append=True) as file:
+                offset = file.seek(0, os.SEEK_END)
+                file.write(header + fields)
+
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            self._index[key_id] = offset
+            self._remember(key_id, key)
+        return key_id
+
+    def get(self, key_id: str) -> RSAPrivateKey:
+        """Return the key with the given ID, decoding it from the file on a cache miss."""
+        with self._lock:
+            key = self._cache.get(key_id)
+            if key is not None:
+                self.cache_hits += 1
+                self._cache.move_to_end(key_id)
+                return key
+
+            self.cache_misses += 1
+            if key_id not in self._index:
+                raise KeyError(f"Key '{key_id}' is not in the key store.")
+
+            buffer = self._map()
+            offset = self._index[key_id]
+            key_type, field_count, _, _, _, _ = RECORD_HEADER.unpack_from(buffer, offset)
+            if key_type != KEY_TYPE_RSA_PRIVATE:
+                raise ValueError(f"Unsupported key type {key_type}.")
+
+            key = RSAPrivateKey(*decode_fields(buffer, offset + RECORD_HEADER.size, field_count))
+            self._remember(key_id, key)
+            return key
+
+    def _remember(self, key_id: str, key: RSAPrivateKey):
+        self._cache[key_id] = key
+        self._cache.move_to_end(key_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def key_ids(self) -> list:
+        """Return the IDs of all stored keys in insertion order."""
+        with self._lock:
+            return list(self._index)
+
+    def __contains__(self, key_id) -> bool:
+        return key_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self):
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
@@ -1,7 +1,14 @@
+import queue
+import threading
+
 import customtkinter as ctk
 from tkinter import messagebox
-from algorithms import AlgorithmSelector
-from config import ALGORITHM_METADATA
+from algorithms import AlgorithmSelector, OperationCancelled
+from algorithms_type.rsa_key_pool import RSAKeyPool
+from registry import ALGORITHM_METADATA
+
+POLL_INTERVAL_MS = 16  # How often the UI checks for worker updates (about 60 per second)
+RESULT_PREVIEW_CHARS = 100_000  # Longer results are truncated in the result box
 
 
 class AlgorithmApp(ctk.CTk):
@@ -12,6 +19,8 @@ class AlgorithmApp(ctk.CTk):
         self.title("Encryption Algorithm Selector")
         self.geometry("600x550")
         self.algorithms = ALGORITHM_METADATA
+        self.job_updates = queue.Queue()  # Messages from the worker thread, drained by poll_job
+        self.cancel_event = None  # Set while a job is in flight
         self.create_widgets()
 
     def create_widgets(self):
@@ -73,6 +82,21 @@ class AlgorithmApp(ctk.CTk):
         )
         self.button_encrypt.grid(row=6, column=1, padx=10, pady=20, sticky="e")
 
+        # Cancel button, enabled while a job is in flight
+        self.button_cancel = ctk.CTkButton(
+            self,
+            text="Cancel",
+            command=self.cancel_job,
+            state="disabled"
+        )
+        self.button_cancel.grid(row=6, column=0, padx=10, pady=20, sticky="w")
+
+        # Progress indicator, shown while a job is in flight
+        self.progress_bar = ctk.CTkProgressBar(self, width=400)
+        self.progress_bar.grid(row=7, column=1, padx=10, pady=10)
+        self.progress_bar.set(0)
+        self.progress_bar.grid_remove()
+
         self.update_key_input("Caesar Cipher")
 
     def update_key_input(self, algorithm):
@@ -86,7 +110,7 @@ class AlgorithmApp(ctk.CTk):
             self.label_key.configure(text=f"Enter {algorithm_data['key_label']}:")
 
         # Toggle special characters checkbox
-        self.toggle_widget(self.checkbox_special_chars, algorithm in ["Vigenere Cipher", "Caesar Cipher"])
+        self.toggle_widget(self.checkbox_special_chars, algorithm_data["special_chars"])
 
         # Manage generated key visibility
         generated_key = algorithm_data.get("generated_key", False)
@@ -98,6 +122,7 @@ class AlgorithmApp(ctk.CTk):
         widget.grid() if show else widget.grid_remove()
 
     def run_algorithm(self):
+        """Validate the inputs on the UI thread, then run the encryption in a worker thread."""
         try:
             # Close all open popups before starting a new encryption
             self.close_all_popups()
@@ -123,39 +148,117 @@ class AlgorithmApp(ctk.CTk):
                 return
 
             include_special_chars = (
-                self.include_special_chars.get() if algorithm in ["Vigenere Cipher", "Caesar Cipher"] else None
-            )
-            result = self.algorithm_selector.run_algorithm(
-                algorithm, message, key, include_special_chars
+                self.include_special_chars.get() if self.algorithms[algorithm]["special_chars"] else None
             )
 
-            # Ensure `result_output` exists
-            if self.result_output.winfo_exists():
-                self.result_output.delete("1.0", "end")
-                self.result_output.insert("1.0", result)
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {e}")
+            return
+
+        self.start_job(algorithm, message, key, include_special_chars)
+
+    def start_job(self, algorithm, message, key, include_special_chars):
+        """Disable the Encrypt button, show progress and start the worker thread."""
+        self.cancel_event = threading.Event()
+        self.button_encrypt.configure(state="disabled")
+        self.button_cancel.configure(state="normal")
+
+        self.progress_bar.grid()
+        if self.algorithms[algorithm].get("chunked", False):
+            self.progress_bar.configure(mode="determinate")
+            self.progress_bar.set(0)
+        else:
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+
+        worker = threading.Thread(
+            target=self.run_job,
+            args=(algorithm, message, key, include_special_chars, self.cancel_event),
+            daemon=True
+        )
+        worker.start()
+        self.after(POLL_INTERVAL_MS, self.poll_job)
 
-            # Handle generated keys
+    def run_job(self, algorithm, message, key, include_special_chars, cancel_event):
+        """Worker thread body; reports back only through `job_updates`, never touching widgets."""
+        try:
+            result = self.algorithm_selector.run_algorithm_with_progress(
+                algorithm, message, key, include_special_chars,
+                progress=lambda done, total: self.job_updates.put(("progress", done / total if total else 1.0)),
+                cancelled=cancel_event.is_set
+            )
+            generated_key = None
             if self.algorithms[algorithm].get("generated_key", False):
                 generated_key = self.algorithm_selector.get_generated_key(algorithm)
-                if generated_key:
-                    # Safely reset or recreate `generated_key_output`
-                    self.reset_generated_key_output()
-
-                    # Create a new frame inside `generated_key_output` for buttons
-                    button_frame = ctk.CTkFrame(self.generated_key_output)
-                    button_frame.grid(row=0, column=0, sticky="nsew")
-
-                    # Add buttons for each key inside the new frame
-                    for key_name, key_value in generated_key.items():
-                        key_button = ctk.CTkButton(
-                            button_frame,
-                            text=key_name,
-                            command=lambda k_name=key_name, k_value=key_value: self.show_key_popup(k_name, k_value)
-                        )
-                        key_button.grid(pady=5, padx=5, sticky="w")
-
+            self.job_updates.put(("done", result, generated_key))
+        except OperationCancelled:
+            self.job_updates.put(("cancelled",))
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {e}")
+            self.job_updates.put(("error", e))
+
+    def poll_job(self):
+        """Apply worker updates on the UI thread and reschedule until the job finishes."""
+        latest_progress = None
+        while True:
+            try:
+                update = self.job_updates.get_nowait()
+            except queue.Empty:
+                break
+
+            if update[0] == "progress":
+                latest_progress = update[1]
+                continue
+
+            self.finish_job()
+            if update[0] == "done":
+                self.show_result(*update[1:])
+            elif update[0] == "error":
+                messagebox.showerror("Error", f"An error occurred: {update[1]}")
+            return
+
+        if latest_progress is not None:
+            self.progress_bar.set(latest_progress)
+        self.after(POLL_INTERVAL_MS, self.poll_job)
+
+    def cancel_job(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.button_cancel.configure(state="disabled")
+
+    def finish_job(self):
+        """Restore the controls once the worker has reported its outcome."""
+        self.cancel_event = None
+        self.progress_bar.stop()
+        self.progress_bar.grid_remove()
+        self.button_cancel.configure(state="disabled")
+        self.button_encrypt.configure(state="normal")
+
+    def show_result(self, result, generated_key):
+        # Ensure `result_output` exists
+        if self.result_output.winfo_exists():
+            if len(result) > RESULT_PREVIEW_CHARS:
+                # Inserting megabytes into a text widget would stall the UI
+                result = f"{result[:RESULT_PREVIEW_CHARS]}... ({len(result)} characters)"
+            self.result_output.delete("1.0", "end")
+            self.result_output.insert("1.0", result)
+
+        # Handle generated keys
+        if generated_key:
+            # Safely reset or recreate `generated_key_output`
+            self.reset_generated_key_output()
+
+            # Create a new frame inside `generated_key_output` for buttons
+            button_frame = ctk.CTkFrame(self.generated_key_output)
+            button_frame.grid(row=0, column=0, sticky="nsew")
+
+            # Add buttons for each key inside the new frame
+            for key_name, key_value in generated_key.items():
+                key_button = ctk.CTkButton(
+                    button_frame,
+                    text=key_name,
+                    command=lambda k_name=key_name, k_value=key_value: self.show_key_popup(k_name, k_value)
+                )
+                key_button.grid(pady=5, padx=5, sticky="w")
 
     def show_key_popup(self, title, key_content):
         """ Show a popup window displaying the full content of a key or IV. """
@@ -207,6 +310,6 @@ class AlgorithmApp(ctk.CTk):
 
 
 if __name__ == "__main__":
-    selector = AlgorithmSelector()
+    selector = AlgorithmSelector(rsa_key_pool=RSAKeyPool(depth=2))
     app = AlgorithmApp(selector)
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,444 @@
+"""
+Registry of the available algorithms and the capabilities of each.
+
+Every algorithm is described by an AlgorithmSpec: its key type, whether it can stream,
+how batches are executed and whether it generates its own key material. The module that
+implements an algorithm is imported the first time the algorithm is used, so importing
+the registry (and `algorithms`) does not load any cipher code.
+
+Third-party algorithms subclass AlgorithmSpec and call `register_algorithm`; they then
+appear in ALGORITHM_METADATA and can be run through AlgorithmSelector (and, with
+`streaming` or their own `byte_stream`, the CLI). Batches run in a process pool look
+the algorithm up again in the worker, so register it at import time of a module the
+workers also import (or use the default fork start method).
+"""
+import importlib
+
+RSA_STEP_SIZE = 1024  # Characters per step of the per-character RSA engine (~0.1 s)
+
+ALGORITHM_REGISTRY = {}  # Algorithm name -> AlgorithmSpec, in registration order
+ALGORITHM_METADATA = {}  # Algorithm name -> metadata dict for the GUI and CLI, derived from the registry
+
+
+class AlgorithmSpec:
+    """
+    Describes one algorithm and adapts its module to the selector.
+
+    Subclasses set the class attributes and implement `encrypt`; algorithms with
+    `streaming` implement `stream`, and those with `generated_key` usually override
+    `prepare_batch` and `format_generated_key`.
+    """
+    name = None
+    module = None  # Dotted path of the implementing module
+    key_type = "none"  # "int", "str", or "none" when key material is generated
+    key_label = ""
+    streaming = False  # Whether `stream` can encrypt input chunk by chunk
+    stepwise = False  # Whether `encrypt_steps` can encrypt one message in cancellable steps
+    batch_executor = "inline"  # Default executor for batches: "inline", "thread" or "process"
+    generated_key = False
+    special_chars = False  # Whether include_special_chars applies (keeps or drops non-letters)
+
+    def load(self):
+        """Import the implementing module on first use."""
+        return importlib.import_module(self.module)
+
+    @property
+    def metadata(self) -> dict:
+        return {
+            "key_type": self.key_type,
+            "key_label": self.key_label,
+            "generated_key": self.generated_key,
+            "special_chars": self.special_chars,
+            "batch_executor": self.batch_executor,
+            "chunked": self.streaming or self.stepwise,
+        }
+
+    def encrypt(self, message, key, include_special_chars, context: dict) -> tuple:
+        """
+        Encrypt one message; returns the encrypted message and the generated key metadata, or None.
+
+        `context` holds the selector's optional "key_pool" and "keystore".
+        """
+        raise NotImplementedError
+
+    def stream(self, chunks, key, include_special_chars) -> tuple:
+        """Return an iterator of encrypted chunks and the separator that joins them."""
+        raise ValueError(f"{self.name} does not support streaming.")
+
+    def byte_stream(self, source, key, include_special_chars, key_material: dict, chunk_size: int, iv=None):
+        """
+        Return an iterator of encrypted byte chunks for a binary file-like source, as the CLI writes them.
+
+        Generated key material is added to `key_material` as JSON-ready values. By default the
+        source is decoded as UTF-8 and what `stream` yields is encoded back, so algorithms with
+        `streaming` only override this when their byte output differs from their text output.
+        """
+        if not self.streaming:
+            raise ValueError(f"{self.name} does not support streaming.")
+        import io
+
+        from algorithms_type.streaming import iter_chunks
+
+        text = io.TextIOWrapper(source, encoding="utf-8", newline="")
+        encrypted_chunks, separator = self.stream(iter_chunks(text, chunk_size), key, include_special_chars)
+        return encoded_chunks(encrypted_chunks, separator)
+
+    def encrypt_steps(self, message, key, include_special_chars, context: dict, chunk_size: int):
+        """
+        Generator encrypting one message in steps of about `chunk_size`, for progress and cancellation.
+
+        Yields (done, total) after each step and returns what `encrypt` returns. Used by
+        algorithms with `stepwise`, which generate their keys and so cannot use `stream`.
+        """
+        raise ValueError(f"{self.name} cannot be encrypted in steps.")
+
+    def encrypt_into(self, data, out, key, include_special_chars, context: dict) -> tuple:
+        """
+        Encrypt any buffer-protocol object into `out` (or a new buffer when None).
+
+        Returns a memoryview of the ciphertext and the generated key metadata, or None.
+        """
+        raise ValueError(f"{self.name} does not support bytes input.")
+
+    def prepare_batch(self, messages: list, key, include_special_chars, context: dict) -> tuple:
+        """
+        One-off setup for a batch; returns the messages to encrypt, the parameters passed
+        to `encrypt_batch_item` and the generated key metadata (or None).
+        """
+        return messages, {"key": key, "include_special_chars": include_special_chars}, None
+
+    def encrypt_batch_item(self, message, params: dict) -> tuple:
+        """Encrypt one message of a batch; returns the encrypted message and any per-message extra."""
+        encrypted_message, _ = self.encrypt(message, params["key"], params["include_special_chars"], {})
+        return encrypted_message, None
+
+    def finish_batch(self, metadata, extras: list):
+        """Combine the batch metadata with the per-message extras, in input order."""
+        return metadata
+
+    def format_generated_key(self, metadata: dict):
+        """Generated key metadata as display strings, or None for algorithms without generated keys."""
+        return None
+
+    def batch_response(self, metadata, index: int) -> dict:
+        """The generated key material that goes with message `index` of a batch, for per-message responses."""
+        return {}
+
+    def stored_key_metadata(self, key, key_id: str) -> dict:
+        """Generated key metadata for a key loaded from the key store, for `format_generated_key`."""
+        raise ValueError(f"{self.name} does not keep its keys in the key store.")
+
+
+class CaesarSpec(AlgorithmSpec):
+    name = "Caesar Cipher"
+    module = "algorithms_type.caesar_cipher"
+    key_type = "int"
+    key_label = "Number of Shifts"
+    streaming = True
+    special_chars = True
+
+    def encrypt(self, message, key, include_special_chars, context):
+        return self.load().caesar_main(message, key, include_special_chars), None
+
+    def stream(self, chunks, key, include_special_chars):
+        return self.load().caesar_stream(chunks, key, include_special_chars), ''
+
+    def encrypt_into(self, data, out, key, include_special_chars, context):
+        return self.load().caesar_encrypt_into(data, key, include_special_chars, out), None
+
+
+class VigenereSpec(AlgorithmSpec):
+    name = "Vigenere Cipher"
+    module = "algorithms_type.vigenere_cipher"
+    key_type = "str"
+    key_label = "Key"
+    streaming = True
+    special_chars = True
+
+    def encrypt(self, message, key, include_special_chars, context):
+        return self.load().vigenere_main(message, key, include_special_chars), None
+
+    def stream(self, chunks, key, include_special_chars):
+        return self.load().vigenere_stream(chunks, key, include_special_chars), ''
+
+    def encrypt_into(self, data, out, key, include_special_chars, context):
+        return self.load().vigenere_encrypt_into(data, key, include_special_chars, out), None
+
+
+class RC4Spec(AlgorithmSpec):
+    name = "RC4 Stream Cipher"
+    module = "algorithms_type.rc4_stream_cipher"
+    key_type = "str"
+    key_label = "Key"
+    streaming = True
+
+    def encrypt(self, message, key, include_special_chars, context):
+        return self.load().rc4_main(message, key), None
+
+    def stream(self, chunks, key, include_special_chars):
+        cipher = self.load().RC4(key)
+        # The hex bytes of consecutive chunks are joined by a space
+        return (cipher.update(chunk.encode()).hex(' ') for chunk in chunks), ' '
+
+    def byte_stream(self, source, key, include_special_chars, key_material, chunk_size, iv=None):
+        from algorithms_type.streaming import iter_chunks
+
+        cipher = self.load().RC4(key)
+        return (cipher.update(chunk) for chunk in iter_chunks(source, chunk_size))
+
+    def encrypt_into(self, data, out, key, include_special_chars, context):
+        return self.load().rc4_encrypt_into(data, key, out), None
+
+
+class RSASpec(AlgorithmSpec):
+    name = "RSA"
+    module = "algorithms_type.rsa"
+    batch_executor = "process"
+    generated_key = True
+    stepwise = True
+
+    def encrypt(self, message, key, include_special_chars, context):
+        result = self.load().rsa_main(message, key_pool=context.get("key_pool"))
+        return result["encrypted_message"], self.key_metadata(result["key"], context, result["byte_lengths"])
+
+    def encrypt_steps(self, message, key, include_special_chars, context, chunk_size):
+        rsa = self.load()
+        rsa_key = self.new_key(context)
+        yield 0, len(message)  # Key generation is the first step
+
+        chunk_size = min(chunk_size, RSA_STEP_SIZE)
+        values = []
+        for i in range(0, len(message), chunk_size):
+            values += rsa.encrypt_message(message[i:i + chunk_size], rsa_key.public_key)
+            yield min(len(message), i + chunk_size), len(message)
+        byte_lengths = [(value.bit_length() + 7) // 8 for value in values]
+        return rsa.encode_to_base64(values), self.key_metadata(rsa_key, context, byte_lengths)
+
+    def encrypt_into(self, data, out, key, include_special_chars, context):
+        rsa_key = self.new_key(context)
+        return self.load().rsa_encrypt_into(data, rsa_key.public_key, out), self.key_metadata(rsa_key, context, None)
+
+    def byte_stream(self, source, key, include_special_chars, key_material, chunk_size, iv=None):
+        """Packed RSA blocks (see `rsa.encrypt_bytes_packed`); only the final block is padded."""
+        from algorithms_type.streaming import iter_chunks
+
+        rsa = self.load()
+        rsa_key = self.new_key({})
+        plain_size, block_size = rsa.packed_block_sizes(rsa_key.n)
+        key_material.update(rsa_key._asdict(), block_size=block_size)
+        return packed_blocks(rsa, iter_chunks(source, chunk_size), rsa_key.public_key, plain_size)
+
+    def new_key(self, context: dict):
+        """A keypair from the selector's key pool, or a freshly generated one."""
+        from algorithms_type.rsa import generate_rsa_key
+
+        key_pool = context.get("key_pool")
+        return key_pool.get() if key_pool is not None else generate_rsa_key()
+
+    def key_metadata(self, rsa_key, context: dict, byte_lengths) -> dict:
+        keystore = context.get("keystore")
+        return {
+            "public_key": rsa_key.public_key,
+            "private_key": rsa_key.private_key,
+            "key": rsa_key,  # The full RSAPrivateKey; decryption needs its CRT parameters
+            "byte_lengths": byte_lengths,
+            "key_id": keystore.put(rsa_key) if keystore is not None else None
+        }
+
+    def stored_key_metadata(self, key, key_id):
+        return dict(self.key_metadata(key, {}, None), key_id=key_id)
+
+    def prepare_batch(self, messages, key, include_special_chars, context):
+        rsa_key = self.new_key(context)
+        params = {"keys": (rsa_key.public_key, rsa_key.private_key)}
+        return messages, params, self.key_metadata(rsa_key, context, None)
+
+    def encrypt_batch_item(self, message, params):
+        encrypted_message, byte_lengths, _ = self.load().rsa_encryption(message, params["keys"])
+        return encrypted_message, byte_lengths
+
+    def finish_batch(self, metadata, extras):
+        return dict(metadata, byte_lengths=extras)
+
+    def batch_response(self, metadata, index):
+        response = {"public_key": metadata["public_key"], "private_key": metadata["private_key"],
+                    "key": metadata["key"]._asdict()}
+        if metadata.get("byte_lengths") is not None:
+            response["byte_lengths"] = metadata["byte_lengths"][index]
+        return response
+
+    def format_generated_key(self, metadata):
+        public_key = metadata["public_key"]
+        private_key = metadata["private_key"]
+        generated_key = {
+            "public_key": f"{public_key[0]},{public_key[1]}",
+            "private_key": f"{private_key[0]},{private_key[1]}",
+        }
+        if metadata.get("key") is not None:
+            from algorithms_type.rsa import format_private_key
+
+            # Everything decryption needs, in the form `rsa.parse_private_key` reads
+            generated_key["crt_private_key"] = format_private_key(metadata["key"])
+        if metadata.get("key_id") is not None:
+            generated_key["key_id"] = metadata["key_id"]
+        return generated_key
+
+
+class AESSpec(AlgorithmSpec):
+    name = "AES"
+    module = "algorithms_type.aes"
+    batch_executor = "process"
+    generated_key = True
+    stepwise = True
+
+    def encrypt(self, message, key, include_special_chars, context):
+        result = self.load().aes_main(message)
+        return result["encrypted_message"], {"key": result["key"], "iv": result["iv"]}
+
+    def encrypt_steps(self, message, key, include_special_chars, context, chunk_size):
+        aes = self.load()
+        aes_key, iv = aes.generate_key(), aes.generate_iv()
+        pieces = []
+        for done, encrypted_chunk in cbc_steps(aes, message.encode(), aes_key, iv, chunk_size):
+            pieces.append(aes.ciphertext_to_hex(encrypted_chunk))
+            yield done
+        return "".join(pieces), {"key": aes_key.hex(), "iv": iv.hex()}
+
+    def encrypt_into(self, data, out, key, include_special_chars, context):
+        aes = self.load()
+        aes_key, iv = aes.generate_key(), aes.generate_iv()
+        return aes.aes_encrypt_into(data, aes_key, iv, out), {"key": aes_key.hex(), "iv": iv.hex()}
+
+    def byte_stream(self, source, key, include_special_chars, key_material, chunk_size, iv=None):
+        """AES-CBC with PKCS#7 padding under a hex `key` and `iv`, each generated when not given."""
+        from algorithms_type.streaming import iter_chunks
+
+        aes = self.load()
+        aes_key = bytes.fromhex(key) if key else aes.generate_key()
+        iv = bytes.fromhex(iv) if iv else aes.generate_iv()
+        if len(iv) != 16:
+            raise ValueError("AES IV must be 16 bytes (32 hex digits).")
+        key_material.update(key=aes_key.hex(), iv=iv.hex())
+        return aes.aes_encrypt_cbc_stream(iter_chunks(source, chunk_size), aes_key, iv)
+
+    def prepare_batch(self, messages, key, include_special_chars, context):
+        aes = self.load()
+        aes_key = aes.generate_key()
+        ivs = [aes.generate_iv() for _ in messages]
+        metadata = {"key": aes_key.hex(), "ivs": [iv.hex() for iv in ivs]}
+        return list(zip(messages, ivs)), {"key": aes_key}, metadata
+
+    def encrypt_batch_item(self, message, params):
+        aes = self.load()
+        message, iv = message
+        return aes.aes_encrypt_cbc(aes.message_padding(message), params["key"], iv).hex(), None
+
+    def batch_response(self, metadata, index):
+        return {"key": metadata["key"], "iv": metadata["ivs"][index]}
+
+    def format_generated_key(self, metadata):
+        if "ivs" in metadata:  # Set by a batch
+            return {"key": metadata["key"], "ivs": ",".join(metadata["ivs"])}
+        return {"key": metadata["key"], "iv": metadata["iv"]}
+
+
+class HybridSpec(RSASpec):
+    """RSA-wrapped AES session keys; the RSA keypair is generated and reported like RSA's."""
+    name = "Hybrid RSA+AES"
+    module = "algorithms_type.hybrid"
+
+    def encrypt(self, message, key, include_special_chars, context):
+        result = self.load().hybrid_main(message, key_pool=context.get("key_pool"))
+        return result["encrypted_message"], self.key_metadata(result["key"], context, None)
+
+    def encrypt_steps(self, message, key, include_special_chars, context, chunk_size):
+        import base64
+
+        from algorithms_type import aes
+
+        rsa_key = self.new_key(context)
+        header, session_key, iv = self.load().hybrid_header(rsa_key.public_key)
+        data = message.encode()
+        yield 0, len(data)  # Key generation and wrapping are the first step
+
+        pieces = [header]
+        for done, encrypted_chunk in cbc_steps(aes, data, session_key, iv, chunk_size):
+            pieces.append(encrypted_chunk)
+            yield done
+        return base64.b64encode(b"".join(pieces)).decode('utf-8'), self.key_metadata(rsa_key, context, None)
+
+    def encrypt_into(self, data, out, key, include_special_chars, context):
+        rsa_key = self.new_key(context)
+        return self.load().hybrid_encrypt_into(data, rsa_key.public_key, out), self.key_metadata(rsa_key, context, None)
+
+    def byte_stream(self, source, key, include_special_chars, key_material, chunk_size, iv=None):
+        """The RSA-wrapped session key and IV (see `hybrid.hybrid_header`), then the AES-CBC stream."""
+        from itertools import chain
+
+        from algorithms_type.aes import aes_encrypt_cbc_stream
+        from algorithms_type.streaming import iter_chunks
+
+        rsa_key = self.new_key({})
+        key_material.update(rsa_key._asdict())
+        header, session_key, session_iv = self.load().hybrid_header(rsa_key.public_key)
+        return chain((header,), aes_encrypt_cbc_stream(iter_chunks(source, chunk_size), session_key, session_iv))
+
+    def encrypt_batch_item(self, message, params):
+        public_key, _ = params["keys"]
+        return self.load().hybrid_encryption(message, public_key), None
+
+    def finish_batch(self, metadata, extras):
+        return metadata
+
+
+def cbc_steps(aes, data: bytes, key: bytes, iv: bytes, chunk_size: int):
+    """Yield ((done, total), ciphertext chunk) while AES-CBC encrypting data `chunk_size` bytes at a time."""
+    chunks = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+    done = 0
+    for encrypted_chunk in aes.aes_encrypt_cbc_stream(chunks, key, iv):
+        done = min(len(data), done + len(encrypted_chunk))
+        yield (done, len(data)), encrypted_chunk
+
+
+def encoded_chunks(chunks, separator: str):
+    """UTF-8 encode a stream of text chunks, with the separator between consecutive chunks."""
+    first = True
+    for chunk in chunks:
+        if separator and not first:
+            yield separator.encode()
+        yield chunk.encode()
+        first = False
+
+
+def packed_blocks(rsa, chunks, public_key: tuple, plain_size: int):
+    """Encrypt byte chunks as packed RSA blocks, holding back the bytes that do not fill a block."""
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk
+        cut = len(data) - len(data) % plain_size
+        carry = data[cut:]
+        if cut:
+            yield rsa.encrypt_bytes_packed(data[:cut], public_key, final=False)
+    yield rsa.encrypt_bytes_packed(carry, public_key)
+
+
+def register_algorithm(spec: AlgorithmSpec, replace=False) -> AlgorithmSpec:
+    """Add an algorithm to the registry; an existing name is only replaced when `replace` is true."""
+    if not spec.name:
+        raise ValueError("Algorithm spec must have a name.")
+    if spec.name in ALGORITHM_REGISTRY and not replace:
+        raise ValueError(f"Algorithm '{spec.name}' is already registered.")
+    ALGORITHM_REGISTRY[spec.name] = spec
+    ALGORITHM_METADATA[spec.name] = spec.metadata
+    return spec
+
+
+def get_algorithm(name: str) -> AlgorithmSpec:
+    if name not in ALGORITHM_REGISTRY:
+        raise ValueError(f"Algorithm '{name}' is not available.")
+    return ALGORITHM_REGISTRY[name]
+
+
+for builtin_spec in (CaesarSpec(), VigenereSpec(), RC4Spec(), RSASpec(), AESSpec(), HybridSpec()):
+    register_algorithm(builtin_spec)
+del builtin_spec
@@ -0,0 +1,31 @@
+import string
+
+import pytest
+
+from algorithms_type.caesar_cipher import TRANSLATE_CHUNK_SIZE, caesar_encrypt_into, encrypt_message
+
+TEXT = string.ascii_letters + string.digits + " .,!?\n"
+
+
+@pytest.mark.parametrize("include_special_chars", [True, False])
+@pytest.mark.parametrize("shift", range(-60, 100))
+def test_bytes_path_matches_str_path(shift, include_special_chars):
+    try:
+        expected = encrypt_message(TEXT, shift, include_special_chars)
+    except ValueError:
+        expected = None
+    if expected is None or not expected.isascii():
+        with pytest.raises(ValueError):
+            caesar_encrypt_into(TEXT.encode(), shift, include_special_chars)
+    else:
+        assert bytes(caesar_encrypt_into(TEXT.encode(), shift, include_special_chars)) == expected.encode()
+
+
+@pytest.mark.parametrize("include_special_chars", [True, False])
+def test_encrypt_into_buffer_across_chunks(include_special_chars):
+    text = TEXT * (3 * TRANSLATE_CHUNK_SIZE // len(TEXT))
+    expected = encrypt_message(text, 30, include_special_chars).encode()
+    out = bytearray(len(text) + 5)
+    assert bytes(caesar_encrypt_into(text.encode(), 30, include_special_chars, out)) == expected
+    with pytest.raises(ValueError, match=f"{len(expected)} bytes needed"):
+        caesar_encrypt_into(text.encode(), 30, include_special_chars, bytearray(len(expected) - 1))
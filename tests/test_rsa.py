@@ -0,0 +1,15 @@
+from algorithms_type import instrumentation
+from algorithms_type.rsa import decrypt_bytes_packed, encrypt_bytes_packed, generate_rsa_key
+
+
+def test_decrypt_records_modexp_phase():
+    key = generate_rsa_key(512)
+    ciphertext = encrypt_bytes_packed(b"attack at dawn", key.public_key)
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        assert decrypt_bytes_packed(ciphertext, key) == b"attack at dawn"
+        assert instrumentation.snapshot()["rsa.decrypt_modexp"]["calls"] >= 1
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()